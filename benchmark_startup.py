@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List, Optional
+
+from utils import get_writable_path
+
+
+# Historique des mesures (une ligne JSON par exécution du benchmark), pour suivre l'évolution du démarrage
+HISTORY_FILE: str = "logs/startup_benchmark.jsonl"
+
+# Mesure, dans un interpréteur neuf, la durée de l'import des modules de l'application
+IMPORT_SNIPPET: str = (
+    "import time, json; start = time.perf_counter(); import mvc.controller; "
+    "print(json.dumps({'import_application': round((time.perf_counter() - start) * 1000, 1)}))"
+)
+
+
+def _run(command: List[str]) -> Dict[str, float]:
+    """
+    Exécute une mesure dans un nouveau processus (démarrage à froid de l'interpréteur).
+
+    Args:
+        command: La commande à exécuter ; sa dernière ligne de sortie doit être un objet JSON de durées.
+
+    Returns:
+        Les durées (ms) relevées par le processus, plus "wall" : sa durée totale vue de l'extérieur.
+    """
+    start: float = time.perf_counter()
+    completed: subprocess.CompletedProcess = subprocess.run(
+        command, capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    wall: float = round((time.perf_counter() - start) * 1000, 1)
+    timings: Dict[str, float] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {**timings, "wall": wall}
+
+
+def _summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Calcule médiane, minimum et maximum de chaque durée sur l'ensemble des exécutions."""
+    return {
+        name: {
+            "median": round(statistics.median(s[name] for s in samples), 1),
+            "min": min(s[name] for s in samples),
+            "max": max(s[name] for s in samples),
+        }
+        for name in samples[0]
+    }
+
+
+def benchmark(runs: int, gui: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Mesure le démarrage de l'application sur plusieurs exécutions.
+
+    Args:
+        runs: Nombre d'exécutions par mesure.
+        gui: Mesure aussi le démarrage complet de l'interface (main.py --profile --exit).
+            Par défaut, seulement si un affichage est disponible.
+
+    Returns:
+        Le résumé des mesures (médiane, min, max par étape).
+    """
+    if gui is None:
+        gui = sys.platform != "linux" or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+    results: Dict[str, Any] = {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "runs": runs,
+        # Imports seuls : mesurable sans affichage (ex: intégration continue)
+        "import": _summarize([_run([sys.executable, "-c", IMPORT_SNIPPET]) for _ in range(runs)]),
+    }
+    if gui:
+        results["gui"] = _summarize(
+            [_run([sys.executable, "main.py", "--profile", "--exit"]) for _ in range(runs)]
+        )
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mesure le temps de démarrage à froid de l'application.")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre d'exécutions par mesure (défaut: 5)")
+    parser.add_argument("--no-gui", action="store_true", help="Ne mesure que les imports (sans affichage)")
+    args = parser.parse_args()
+
+    summary: Dict[str, Any] = benchmark(args.runs, gui=False if args.no_gui else None)
+    for section in ("import", "gui"):
+        for name, values in summary.get(section, {}).items():
+            print(f"{section:<7} {name:<20} médiane {values['median']:>8.1f} ms "
+                  f"(min {values['min']:.1f}, max {values['max']:.1f})")
+
+    # Ajoute la mesure à l'historique
+    with open(get_writable_path(HISTORY_FILE), mode="a", encoding="utf-8") as f:
+        f.write(json.dumps(summary, ensure_ascii=False) + "\n")
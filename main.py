@@ -1,17 +1,92 @@
-import ttkbootstrap as ttk
+import time
+import json
+import argparse
+from typing import Dict
 
-from mvc.controller import ApplicationController
+# Instant de référence du profil de démarrage (avant les imports de l'application)
+START_TIME: float = time.perf_counter()
 
 
-if __name__ == '__main__':
+def _elapsed_ms(start: float) -> float:
+    """Retourne le temps écoulé depuis start (time.perf_counter()) en millisecondes."""
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def main(profile: bool = False, exit_after_start: bool = False) -> None:
+    """
+    Lance l'application.
+
+    Args:
+        profile: Si True, mesure et affiche la durée des imports et de chaque étape d'initialisation.
+        exit_after_start: Si True, ferme l'application dès la fin de l'initialisation (mesures répétées).
+    """
+    # Durées (ms) de chaque étape du démarrage, relevées en mode profil
+    timings: Dict[str, float] = {}
+
+    # Les imports sont faits ici pour pouvoir être chronométrés en mode profil
+    step_start: float = time.perf_counter()
+    import ttkbootstrap as ttk
+    timings["import_ttkbootstrap"] = _elapsed_ms(step_start)
+
+    step_start = time.perf_counter()
+    from mvc.controller import ApplicationController
+    from mvc.logging_config import setup_logging
+    timings["import_application"] = _elapsed_ms(step_start)
+
+    # Journalisation non bloquante (logs/application.log et logs/events.jsonl)
+    step_start = time.perf_counter()
+    setup_logging()
+    timings["setup_logging"] = _elapsed_ms(step_start)
+
     # Création de la fenêtre principale (Root Window)
     # Utilise le thème "darkly" de ttkbootstrap pour une apparence moderne
-    app = ttk.Window(title="Compresseur de fichiers JPG/JPEG", themename="darkly") 
+    step_start = time.perf_counter()
+    app = ttk.Window(title="Compresseur de fichiers JPG/JPEG", themename="darkly")
     app.geometry("1000x650")
     # Empêche le redimensionnement pour maintenir une disposition stable
     app.resizable(False, False)
+    timings["create_window"] = _elapsed_ms(step_start)
+
     # Initialisation du Contrôleur
     # Le Contrôleur crée et lie le Modèle et la Vue
+    step_start = time.perf_counter()
     controller = ApplicationController(app)
+    timings["create_controller"] = _elapsed_ms(step_start)
+
+    if profile:
+        def on_first_expose(event: object) -> None:
+            # Premier dessin de la fenêtre
+            if "first_paint" not in timings:
+                timings["first_paint"] = _elapsed_ms(START_TIME)
+
+        def on_ready() -> None:
+            # Planifié après ApplicationController.finish_startup() : l'initialisation différée est terminée
+            timings.setdefault("ready", _elapsed_ms(START_TIME))
+            # Les événements de dessin arrivent du serveur d'affichage de manière asynchrone
+            if "first_paint" not in timings:
+                app.after(10, on_ready)
+                return
+            print("Profil de démarrage (ms) :")
+            for name, value in timings.items():
+                print(f"  {name:<20} {value:>8.1f}")
+            # Dernière ligne en JSON, lue par benchmark_startup.py
+            print(json.dumps(timings))
+            if exit_after_start:
+                app.destroy()
+
+        app.bind("<Expose>", on_first_expose, add="+")
+        app.after_idle(on_ready)
+    elif exit_after_start:
+        app.after_idle(app.destroy)
+
     # Lancement de la boucle principale de l'interface graphique
     app.mainloop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compresseur d'images (interface graphique).")
+    parser.add_argument("--profile", action="store_true", help="Affiche la durée des imports et de l'initialisation")
+    parser.add_argument("--exit", action="store_true", help="Quitte dès la fin du démarrage (mesures)")
+    args = parser.parse_args()
+
+    main(profile=args.profile, exit_after_start=args.exit)
@@ -0,0 +1,177 @@
+import io
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from PIL import Image, ImageColor, features
+
+logger = logging.getLogger(__name__)
+
+
+# Intentions de rendu acceptées par l'option 'rendering_intent' (valeurs de ImageCms.Intent)
+INTENTS: Dict[str, int] = {
+    "perceptual": 0,
+    "relative": 1,
+    "saturation": 2,
+    "absolute": 3,
+}
+
+# Modes 16 bits (niveaux de gris) que les encodeurs 8 bits ne savent pas réduire correctement
+SIXTEEN_BIT_MODES: Tuple[str, ...] = ("I;16", "I;16B", "I;16L", "I;16N", "I")
+
+# Transformations ICC déjà construites, partagées par tous les lots (et tous les threads) du processus :
+# {(empreinte du profil source, intention, mode): transformation, ou None si le profil est déjà sRGB}
+_transforms: Dict[Tuple[bytes, int, str], Any] = {}
+_transforms_lock: threading.Lock = threading.Lock()
+
+
+def parse_color(value: str) -> Tuple[int, int, int]:
+    """
+    Convertit une couleur ("#FFFFFF", "#fff", "white", "rgb(255, 255, 255)") en triplet RGB.
+
+    Args:
+        value: La couleur, dans une syntaxe reconnue par PIL.ImageColor.
+
+    Returns:
+        Le triplet (rouge, vert, bleu).
+
+    Raises:
+        ValueError: Si la couleur n'est pas reconnue.
+    """
+    return ImageColor.getrgb(value)[:3]
+
+
+def has_alpha(img: Image.Image) -> bool:
+    """Indique si l'image a un canal alpha (ou une couleur transparente de palette)."""
+    return 'A' in img.getbands() or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def flatten_alpha(img: Image.Image, background: Tuple[int, int, int]) -> Image.Image:
+    """
+    Aplatit la transparence sur une couleur de fond, en une seule passe (composition en C de Pillow).
+    Sans cela, la conversion en RGB ignore simplement l'alpha et fait réapparaître la couleur,
+    souvent noire, des pixels transparents.
+
+    Args:
+        img: L'image avec transparence.
+        background: La couleur de fond (RGB).
+
+    Returns:
+        L'image RGB aplatie.
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    flattened: Image.Image = Image.new('RGB', img.size, background)
+    # Le canal alpha de l'image sert de masque de composition
+    flattened.paste(img, (0, 0), img)
+    return flattened
+
+
+class ColorConverter:
+    """
+    Étape de conversion des couleurs, appliquée une fois par image source juste après le décodage :
+        - les images 16 bits (niveaux de gris) sont réduites à 8 bits par décalage, et non écrêtées ;
+        - les images portant un profil ICC (espace large Display P3 / Adobe RGB, CMJN) sont converties
+          en sRGB, l'espace supposé par les navigateurs et les encodeurs lorsque le profil est perdu ;
+        - les CMJN sans profil sont convertis avec la formule simple de Pillow.
+
+    Les transformations ICC (coûteuses à construire) sont mises en cache par profil source,
+    intention de rendu et mode : un lot d'images d'un même appareil n'en construit qu'une.
+    """
+
+    def __init__(self, intent: str = "perceptual") -> None:
+        """
+        Args:
+            intent: Intention de rendu (clé de INTENTS).
+        """
+        self.intent: int = INTENTS[intent]
+        # La gestion des couleurs nécessite Pillow compilé avec LittleCMS
+        self.available: bool = bool(features.check_module("littlecms2"))
+
+    def convert(self, img: Image.Image) -> Image.Image:
+        """
+        Ramène une image décodée dans un mode 8 bits et dans l'espace sRGB.
+
+        Args:
+            img: L'image source (déjà chargée).
+
+        Returns:
+            L'image convertie (éventuellement la même, si aucune conversion n'est nécessaire).
+        """
+        if img.mode in SIXTEEN_BIT_MODES:
+            img = self._to_8bit(img)
+
+        icc_profile: Optional[bytes] = img.info.get("icc_profile")
+        if icc_profile and self.available and img.mode in ("RGB", "RGBA", "CMYK", "P", "PA"):
+            return self._apply_profile(img, icc_profile)
+
+        if img.mode == "CMYK":
+            return img.convert("RGB")
+        return img
+
+    @staticmethod
+    def _to_8bit(img: Image.Image) -> Image.Image:
+        """Réduit une image en niveaux de gris 16 bits (ou entiers 32 bits) à 8 bits."""
+        if img.mode != "I":
+            img = img.convert("I")
+        # Une image "I" dont les valeurs tiennent déjà sur 8 bits est seulement convertie
+        if img.getextrema()[1] > 255:
+            # Fonction linéaire : évaluée en C par Pillow (pas d'appel Python par pixel)
+            img = img.point(lambda value: value * (1 / 256))
+        return img.convert("L")
+
+    def _apply_profile(self, img: Image.Image, icc_profile: bytes) -> Image.Image:
+        """Convertit une image vers sRGB depuis son profil ICC embarqué (transformation mise en cache)."""
+        if img.mode in ("P", "PA"):
+            img = img.convert("RGBA" if has_alpha(img) else "RGB")
+
+        # La transformation porte sur les canaux de couleur ; l'alpha est reporté tel quel
+        alpha: Optional[Image.Image] = img.getchannel("A") if img.mode == "RGBA" else None
+        color: Image.Image = img.convert("RGB") if alpha is not None else img
+
+        transform: Any = self._get_transform(icc_profile, color.mode)
+        if transform is None:
+            # Profil déjà sRGB (ou inutilisable) : seule la conversion de mode reste à faire
+            return img.convert("RGB") if img.mode == "CMYK" else img
+
+        from PIL import ImageCms
+        converted: Image.Image = ImageCms.applyTransform(color, transform)
+        if alpha is not None:
+            converted.putalpha(alpha)
+        # Le profil source ne décrit plus les pixels : l'image est désormais en sRGB
+        converted.info = {k: v for k, v in img.info.items() if k != "icc_profile"}
+        return converted
+
+    def _get_transform(self, icc_profile: bytes, mode: str) -> Any:
+        """
+        Retourne la transformation (profil source -> sRGB) du cache, en la construisant au premier besoin.
+
+        Args:
+            icc_profile: Le profil ICC embarqué (octets).
+            mode: Le mode des pixels à transformer ("RGB" ou "CMYK").
+
+        Returns:
+            La transformation ImageCms, ou None si le profil source est déjà sRGB ou inutilisable.
+        """
+        # Empreinte du profil : les profils identiques (même appareil) partagent la même entrée
+        key: Tuple[bytes, int, str] = (hashlib.sha1(icc_profile).digest(), self.intent, mode)
+        with _transforms_lock:
+            if key in _transforms:
+                return _transforms[key]
+
+            from PIL import ImageCms
+            transform: Any = None
+            try:
+                source: Any = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+                description: str = ImageCms.getProfileDescription(source).strip()
+                if not (mode == "RGB" and description.lower().startswith("srgb")):
+                    transform = ImageCms.buildTransform(
+                        source, ImageCms.createProfile("sRGB"), mode, "RGB", renderingIntent=self.intent
+                    )
+                    logger.info(f"Transformation ICC construite: {description} ({mode}) -> sRGB")
+            except (OSError, ImageCms.PyCMSError) as e:
+                # Profil illisible ou incompatible avec le mode : ignoré (une seule fois par profil)
+                logger.error(f"Profil ICC ignoré: {e}")
+            _transforms[key] = transform
+            return transform
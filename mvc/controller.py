@@ -3,6 +3,7 @@ from typing import Dict, Any, Tuple
 
 from .model import ApplicationModel
 from .view import ApplicationView
+from .encoders import format_names
 
 
 class ApplicationController:
@@ -18,19 +19,31 @@ class ApplicationController:
             master: La fenêtre principale Tkinter.
         """
         self.master: tk.Tk = master
-        # Initialisation du Modèle (logique et données)
-        self.model: ApplicationModel = ApplicationModel()
-        # Initialisation de la Vue (interface graphique)
+        # Initialisation du Modèle (logique et données), sans lecture de la configuration (différée)
+        self.model: ApplicationModel = ApplicationModel(setup_export=False)
+        # Initialisation de la Vue (interface graphique), avec les formats toujours disponibles
         self.view: ApplicationView = ApplicationView(master)
-        
-        # Synchronisation initiale : Initialise le chemin d'exportation de la Vue avec la valeur du Modèle
-        self.view.export_path_var.set(self.model.export_path)
 
         # Lie les méthodes du contrôleur aux événements des widgets de la vue
         self._attach_commands()
         
         # Initialise l'état des boutons au lancement de l'application
         self.view.update_state_buttons(import_enabled=True, export_enabled=False, reset_enabled=False)
+
+        # Le reste de l'initialisation attend que la fenêtre soit affichée (les tâches d'affichage
+        # de Tk, déjà en attente, passent avant ce rappel)
+        master.after_idle(self.finish_startup)
+
+    def finish_startup(self) -> None:
+        """
+        Termine l'initialisation une fois la fenêtre affichée : lecture du chemin d'exportation
+        persistant et détection des encodeurs (chargement des plugins de Pillow).
+        """
+        self.model.setup_export_path()
+        # Synchronisation initiale : Initialise le chemin d'exportation de la Vue avec la valeur du Modèle
+        self.view.export_path_var.set(self.model.export_path)
+        # Formats de sortie des encodeurs détectés
+        self.view.set_output_formats(format_names())
         
     def _attach_commands(self) -> None:
         """Lie les méthodes du contrôleur (handlers) aux commandes des widgets interactifs de la vue."""
@@ -42,6 +55,7 @@ class ApplicationController:
         widgets['import_button'].configure(command=self.handle_import_images)
         widgets['export_final_button'].configure(command=self.handle_export_images)
         widgets['reset_button'].configure(command=self.handle_reset)
+        widgets['report_button'].configure(command=self.handle_show_report)
         
         # Liaison du bouton de sélection du chemin d'exportation
         widgets['export_path_button'].configure(command=self.handle_select_export_path)
@@ -94,19 +108,23 @@ class ApplicationController:
             self.view.update_state_buttons(import_enabled=True, export_enabled=False, reset_enabled=False)
 
     def handle_optimized_storage_toggle(self) -> None:
-        """Applique ou désactive les réglages pour le mode 'stockage optimisé' (réglages agressifs)."""
+        """
+        Active ou désactive le mode 'stockage optimisé' : le Modèle choisit alors pour chaque image
+        un préréglage (format, qualité, effort) adapté à son contenu (photo, graphisme, capture d'écran).
+        """
         
         # Vérifie l'état actuel de la variable de contrôle
         if self.view.optimized_storage_var.get():
             # --- Activation du mode optimisé ---
-            self.view.set_meter_values(quality=50, resize=75)     # Qualité à 50%, Redimensionnement à 75%
-            self.view.output_format_var.set("WEBP")               # Format de sortie en WEBP (meilleure compression)
+            # Le format et la qualité sont choisis image par image ; seuls les réglages communs sont ajustés
+            self.view.resize_meter.amountusedvar.set(75)         # Redimensionnement à 75%
             self.view.optimized_encoding_var.set(True)            # Encodage optimisé activé
             self.view.strip_metadata_var.set(True)                # Suppression des métadonnées
             self.view.progressive_loading_var.set(True)           # Affichage progressif (si compatible)
             
             self.view.update_status_label(
-                "Mode Stockage Optimisé activé. Les réglages ont été ajustés.", "warning"
+                "Mode Stockage Optimisé activé : le format et la qualité seront choisis selon le contenu de chaque image.",
+                "warning"
             )
         else:
             # --- Retour aux réglages par défaut ---
@@ -115,6 +133,7 @@ class ApplicationController:
             self.view.optimized_encoding_var.set(False)
             self.view.strip_metadata_var.set(False)
             self.view.progressive_loading_var.set(False)
+            self.view.effort_var.set(50)
             
             # Réinitialise le message seulement si aucune image n'est chargée
             if not self.model.data:
@@ -144,6 +163,8 @@ class ApplicationController:
                 'optimized_encoding': self.view.optimized_encoding_var.get(),
                 'progressive_loading': self.view.progressive_loading_var.get(),
                 'strip_metadata': self.view.strip_metadata_var.get(),
+                'effort': self.view.effort_var.get(),
+                'content_aware': self.view.optimized_storage_var.get(),
             }
             
             # Validation simple des paramètres (la validation complète est faite dans le Modèle)
@@ -155,6 +176,9 @@ class ApplicationController:
             # Gestion d'une erreur de lecture des widgets
             self.view.update_status_label(f"Échec de la lecture des paramètres: {e}", "danger")
             return
+
+        # Sauvegarde les options : le mode surveillance de dossier (watch.py) les réutilise
+        self.model.write_options(options)
             
         # Affiche le statut "En cours" et force l'actualisation de l'interface
         self.view.update_status_label("[EN COURS] Démarrage de la compression...", "warning")
@@ -170,6 +194,11 @@ class ApplicationController:
             # Gestion de l'échec de traitement (récupère un message d'erreur si disponible)
             error_msg: str = stats.get("error_msg", "Aucune image n'a été traitée avec succès.")
             self.view.update_status_label(f"Échec de l'exportation. {error_msg}", "danger")
+            # Le rapport reste consultable : il détaille l'erreur de chaque fichier
+            if stats.get("results"):
+                self.view.update_state_buttons(
+                    import_enabled=False, export_enabled=True, reset_enabled=True, report_enabled=True
+                )
         else:
             # Construction du message de succès détaillé avec les statistiques
             message: str = (
@@ -177,10 +206,40 @@ class ApplicationController:
                 f"| {stats['total_old_mo']:.2f} Mo -> {stats['total_new_mo']:.2f} Mo | "
                 f"Différence: {stats['difference_mo']:.2f} Mo ({stats['gain_percent']:.1f}%)"
             )
+            # Politique sans gain : sorties remplacées par l'original et images ignorées
+            if stats.get('kept_count'):
+                message += f" | {stats['kept_count']} original(aux) conservé(s) (aucun gain)"
+            if stats.get('skipped_count'):
+                message += f" | {stats['skipped_count']} image(s) ignorée(s) (aucun gain)"
+            # Mode adapté au contenu : résumé des préréglages choisis (ex: "photo ×12, graphic ×3")
+            if stats.get('presets'):
+                message += " | Profils : " + ", ".join(f"{name} ×{count}" for name, count in stats['presets'].items())
             self.view.update_status_label(message, "success")
             
-            # Réactive le bouton d'importation et maintient le bouton de réinitialisation actif
-            self.view.update_state_buttons(import_enabled=True, export_enabled=False, reset_enabled=True)
+            # Réactive le bouton d'importation, maintient le bouton de réinitialisation actif et active le rapport
+            self.view.update_state_buttons(
+                import_enabled=True, export_enabled=False, reset_enabled=True, report_enabled=True
+            )
+
+    def handle_show_report(self) -> None:
+        """Affiche le rapport détaillé par fichier du dernier export."""
+        self.view.show_results(self.model.last_results, on_export=self.handle_export_report)
+
+    def handle_export_report(self, extension: str) -> None:
+        """
+        Gère l'export du rapport par fichier vers un fichier CSV ou JSON choisi par l'utilisateur.
+
+        Args:
+            extension: Le format du rapport ("csv" ou "json").
+        """
+        path: str = self.view.open_save_report_dialog(extension)
+        if not path:
+            return
+
+        if self.model.export_report(path):
+            self.view.update_status_label(f"Rapport exporté : {path}", "success")
+        else:
+            self.view.update_status_label("Échec de l'export du rapport (voir le journal).", "danger")
 
     def handle_reset(self) -> None:
         """Gère la réinitialisation complète de l'application (données et interface)."""
@@ -194,6 +253,7 @@ class ApplicationController:
         self.view.optimized_encoding_var.set(False)
         self.view.strip_metadata_var.set(False)
         self.view.progressive_loading_var.set(False)
+        self.view.effort_var.set(50)
         self.view.zip_export_var.set(False)
         self.view.delete_originals_var.set(False)
         self.view.add_suffixe_var.set(False) 
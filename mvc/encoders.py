@@ -0,0 +1,284 @@
+import logging
+import importlib
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image, features
+
+logger = logging.getLogger(__name__)
+
+
+def scale_effort(effort: int, low: float, default: float, high: float) -> float:
+    """
+    Convertit l'effort commun (0 à 100) vers l'échelle propre à un codec, de manière
+    linéaire par morceaux : 0 -> low, 50 -> default (réglage par défaut du codec), 100 -> high.
+
+    Args:
+        effort: L'effort demandé (0 = le plus rapide, 100 = les plus petits fichiers).
+        low: Valeur du codec pour l'effort minimal.
+        default: Valeur par défaut du codec (effort 50).
+        high: Valeur du codec pour l'effort maximal.
+
+    Returns:
+        La valeur correspondante sur l'échelle du codec (à arrondir par l'appelant si besoin).
+    """
+    effort = max(0, min(100, effort))
+    if effort <= 50:
+        return low + (default - low) * effort / 50
+    return default + (high - default) * (effort - 50) / 50
+
+
+class EncoderBackend:
+    """
+    Décrit un encodeur de sortie : format Pillow, capacités (transparence, affichage progressif,
+    sans perte, réglage d'effort) et traduction des options de l'application en paramètres Pillow.
+
+    Les sous-classes adaptent build_params() et prepare() aux particularités de leur codec.
+    """
+
+    # Nom affiché et utilisé dans l'option 'output_format' (ex: "WEBP")
+    name: str = ""
+    # Autres noms acceptés pour 'output_format' (ex: "JPG" pour JPEG)
+    aliases: Tuple[str, ...] = ()
+    # Format de sauvegarde de Pillow (clé de Image.SAVE)
+    pillow_format: str = ""
+    # Module de plugin Pillow tiers à importer pour enregistrer le format (None si natif)
+    plugin_module: Optional[str] = None
+
+    # --- Capacités ---
+    supports_alpha: bool = False
+    supports_progressive: bool = False
+    supports_lossless: bool = False
+    # Bornes du réglage d'effort propre au codec (None si le codec n'en a pas)
+    effort_range: Optional[Tuple[int, int]] = None
+
+    def is_available(self) -> bool:
+        """
+        Détecte si le format peut être enregistré avec l'installation de Pillow courante
+        (en important au besoin le plugin tiers qui l'enregistre).
+
+        Returns:
+            True si Pillow sait sauvegarder ce format.
+        """
+        if self.plugin_module:
+            try:
+                importlib.import_module(self.plugin_module)
+            except ImportError:
+                return False
+        Image.init()
+        return self.pillow_format in Image.SAVE
+
+    def build_params(self, quality: int, effort: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Construit les paramètres de sauvegarde Pillow pour ce codec.
+
+        Args:
+            quality: Qualité demandée (1 à 100, Meter de qualité).
+            effort: Effort d'encodage demandé (0 à 100, voir scale_effort()).
+            options: Options complètes de l'exportation (encodage optimisé, métadonnées, progressif).
+
+        Returns:
+            Le dictionnaire de paramètres à passer à Image.save().
+        """
+        pillow_params: Dict[str, Any] = {'quality': quality}
+        # Suppression des métadonnées (EXIF)
+        if options['strip_metadata']:
+            pillow_params['exif'] = b''
+        return pillow_params
+
+    def prepare(self, img: Image.Image, quality: int) -> Image.Image:
+        """
+        Adapte le mode de l'image au codec avant l'encodage.
+
+        Args:
+            img: L'image à encoder.
+            quality: Qualité demandée (1 à 100).
+
+        Returns:
+            L'image prête à être sauvegardée (éventuellement la même).
+        """
+        return img
+
+
+class JpegEncoder(EncoderBackend):
+    """
+    JPEG (libjpeg / libjpeg-turbo). Pillow n'expose pas la quantification en treillis de mozjpeg :
+    lorsque Pillow est lié à mozjpeg, elle est appliquée par la bibliothèque aux encodages
+    optimisés et progressifs, que l'effort élevé active.
+    """
+    name = "JPG"
+    aliases = ("JPEG",)
+    pillow_format = "JPEG"
+    supports_progressive = True
+    # Niveaux : 0 = défaut, 1 = tables de Huffman optimisées, 2 = optimisé et progressif
+    effort_range = (0, 2)
+
+    def build_params(self, quality: int, effort: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        pillow_params: Dict[str, Any] = super().build_params(quality, effort, options)
+        level: int = round(scale_effort(effort, 0, 0, 2))
+        # Ajout des options d'optimisation
+        if options['optimized_encoding'] or level >= 1:
+            pillow_params['optimize'] = True
+        # Affichage progressif
+        if options['progressive_loading'] or level >= 2:
+            pillow_params['progressive'] = True
+        return pillow_params
+
+    def prepare(self, img: Image.Image, quality: int) -> Image.Image:
+        # Si le format est JPEG, les modes RGBA (transparence) ou P (palette) ne sont pas supportés
+        if img.mode in ('RGBA', 'P'):
+            # Convertit l'image au format RGB standard
+            return img.convert('RGB')
+        return img
+
+
+class WebpEncoder(EncoderBackend):
+    """WebP (libwebp) : l'effort pilote le paramètre 'method' (0 = rapide, 6 = plus compact)."""
+    name = "WEBP"
+    pillow_format = "WEBP"
+    supports_alpha = True
+    supports_lossless = True
+    effort_range = (0, 6)
+
+    def build_params(self, quality: int, effort: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        pillow_params: Dict[str, Any] = super().build_params(quality, effort, options)
+        pillow_params['method'] = round(scale_effort(effort, 0, 4, 6))
+        return pillow_params
+
+
+class AvifEncoder(EncoderBackend):
+    """AVIF (Pillow >= 11.2 ou plugin pillow-avif-plugin) : l'effort pilote 'speed' (10 = rapide, 0 = plus compact)."""
+    name = "AVIF"
+    pillow_format = "AVIF"
+    supports_alpha = True
+    supports_lossless = True
+    effort_range = (0, 10)
+
+    def is_available(self) -> bool:
+        # Plugin natif de Pillow, ou à défaut le plugin tiers historique
+        if super().is_available():
+            return True
+        self.plugin_module = "pillow_avif"
+        return super().is_available()
+
+    def build_params(self, quality: int, effort: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        pillow_params: Dict[str, Any] = super().build_params(quality, effort, options)
+        pillow_params['speed'] = round(scale_effort(effort, 10, 6, 0))
+        return pillow_params
+
+
+class JxlEncoder(EncoderBackend):
+    """JPEG XL (plugin pillow-jxl-plugin) : l'effort pilote 'effort' (1 = rapide, 9 = plus compact)."""
+    name = "JXL"
+    pillow_format = "JXL"
+    plugin_module = "pillow_jxl"
+    supports_alpha = True
+    supports_progressive = True
+    supports_lossless = True
+    effort_range = (1, 9)
+
+    def build_params(self, quality: int, effort: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        pillow_params: Dict[str, Any] = super().build_params(quality, effort, options)
+        pillow_params['effort'] = round(scale_effort(effort, 1, 7, 9))
+        # Qualité maximale : encodage sans perte
+        if quality == 100:
+            pillow_params['lossless'] = True
+        return pillow_params
+
+
+class PngQuantEncoder(EncoderBackend):
+    """
+    PNG avec quantification en palette : la qualité fixe le nombre de couleurs (100 = sans perte,
+    en palette exacte si l'image a au plus 256 couleurs) et l'effort le niveau de compression zlib.
+    Pillow n'écrit pas de PNG entrelacé : l'affichage progressif n'est pas proposé.
+    """
+    name = "PNG"
+    pillow_format = "PNG"
+    supports_alpha = True
+    supports_lossless = True
+    effort_range = (0, 9)
+
+    def build_params(self, quality: int, effort: int, options: Dict[str, Any]) -> Dict[str, Any]:
+        # PNG n'a pas de paramètre 'quality' : il est traduit en nombre de couleurs dans prepare()
+        pillow_params: Dict[str, Any] = {'compress_level': round(scale_effort(effort, 1, 6, 9))}
+        # Ajout des options d'optimisation
+        if options['optimized_encoding'] or effort > 50:
+            pillow_params['optimize'] = True
+        return pillow_params
+
+    def prepare(self, img: Image.Image, quality: int) -> Image.Image:
+        if img.mode == 'P':
+            return img
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        if quality == 100:
+            # Sans perte : palette exacte seulement si l'image a au plus 256 couleurs
+            if img.getcolors(256) is None:
+                return img
+            colors: int = 256
+        else:
+            colors = max(2, round(256 * quality / 100))
+        # libimagequant donne de meilleures palettes lorsqu'il est disponible ; FASTOCTREE gère la transparence
+        method: Image.Quantize = (
+            Image.Quantize.LIBIMAGEQUANT if features.check_feature('libimagequant') else Image.Quantize.FASTOCTREE
+        )
+        return img.quantize(colors=colors, method=method)
+
+
+# --- Registre des encodeurs ---
+
+# Encodeurs connus, indexés par nom et par alias (en majuscules)
+ENCODERS: Dict[str, EncoderBackend] = {}
+# Résultat de la détection (effectuée une seule fois, à la première consultation)
+_available: Optional[List[EncoderBackend]] = None
+
+
+def register_encoder(backend: EncoderBackend) -> None:
+    """
+    Ajoute un encodeur au registre (sous son nom et ses alias).
+
+    Args:
+        backend: L'instance d'encodeur à enregistrer.
+    """
+    global _available
+    for key in (backend.name, *backend.aliases):
+        ENCODERS[key.upper()] = backend
+    # Force une nouvelle détection à la prochaine consultation
+    _available = None
+
+
+def available_encoders() -> List[EncoderBackend]:
+    """
+    Retourne les encodeurs utilisables avec l'installation de Pillow courante, dans l'ordre d'enregistrement.
+
+    Returns:
+        La liste des encodeurs disponibles (sans doublon dû aux alias).
+    """
+    global _available
+    if _available is None:
+        backends: List[EncoderBackend] = list(dict.fromkeys(ENCODERS.values()))
+        _available = [backend for backend in backends if backend.is_available()]
+        logger.info(f"Encodeurs disponibles: {', '.join(b.name for b in _available)}")
+    return _available
+
+
+def get_encoder(output_format: str) -> Optional[EncoderBackend]:
+    """
+    Retourne l'encodeur disponible correspondant à un format de sortie (nom ou alias).
+
+    Args:
+        output_format: Le format demandé (ex: "JPG", "JPEG", "WEBP", "AVIF").
+
+    Returns:
+        L'encodeur, ou None si le format est inconnu ou non disponible.
+    """
+    backend: Optional[EncoderBackend] = ENCODERS.get(output_format.upper())
+    return backend if backend in available_encoders() else None
+
+
+def format_names() -> List[str]:
+    """Retourne les noms de formats de sortie disponibles, alias compris (ex: pour les Radiobuttons de la Vue)."""
+    return [name for backend in available_encoders() for name in (backend.name, *backend.aliases)]
+
+
+for _backend in (JpegEncoder(), WebpEncoder(), AvifEncoder(), JxlEncoder(), PngQuantEncoder()):
+    register_encoder(_backend)
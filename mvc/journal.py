@@ -0,0 +1,287 @@
+import os
+import io
+import json
+import time
+import uuid
+import logging
+from typing import Dict, Any, List, Optional
+
+from utils import get_writable_path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows : pas de verrou de journal (un lot n'y est repris que depuis l'interface)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def fsync_path(path: str) -> None:
+    """
+    Force l'écriture sur le disque d'un fichier déjà fermé (données et métadonnées).
+
+    Args:
+        path: Chemin du fichier à synchroniser.
+    """
+    with io.open(path, mode="rb+") as f:
+        os.fsync(f.fileno())
+
+
+def fsync_directory(path: str) -> None:
+    """
+    Rend durable la création ou le renommage d'une entrée dans un répertoire.
+    Sans effet sur les systèmes qui ne permettent pas d'ouvrir un répertoire (Windows).
+
+    Args:
+        path: Chemin du répertoire à synchroniser.
+    """
+    try:
+        fd: int = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BatchJournal:
+    """
+    Journal d'un lot d'exportation, en JSON lines, en ajout seul et synchronisé (fsync)
+    sur le disque à chaque ligne, afin de pouvoir reprendre un lot interrompu.
+
+    La première ligne décrit le lot (options, fichiers, dossier d'export, ZIP) ; chaque ligne
+    suivante enregistre soit la progression d'une image, soit un événement du lot.
+
+    Le processus qui écrit un journal garde un verrou exclusif (flock) sur le fichier pendant
+    toute la durée du lot : un lot en cours se distingue ainsi d'un lot interrompu (le système
+    libère le verrou d'un processus arrêté brutalement), et ne peut pas être repris deux fois.
+    """
+
+    # Dossier RELATIF (à côté de l'exécutable) contenant les journaux de lots
+    JOURNAL_DIR: str = "logs/journals"
+
+    # États successifs d'une image dans le lot (une image encodée mais pas encore écrite
+    # n'est pas journalisée : elle est de toute façon réencodée à la reprise)
+    WRITTEN: str = "written"                    # Fichier de sortie écrit et synchronisé sur le disque
+    ZIPPED: str = "zipped"                      # Image ajoutée au ZIP (durable seulement après "zip_closed")
+    ORIGINAL_DELETED: str = "original_deleted"  # Original supprimé (la sortie est durable)
+    SKIPPED: str = "skipped"                    # Aucune sortie (pas de gain) : l'original est conservé
+
+    # Événements du lot
+    ZIP_CLOSED: str = "zip_closed"
+    COMPLETED: str = "completed"
+
+    def __init__(self, batch_id: str, path: str) -> None:
+        """
+        Initialise un journal vide. Utiliser create() ou open() plutôt que ce constructeur.
+
+        Args:
+            batch_id: Identifiant unique du lot.
+            path: Chemin complet du fichier journal.
+        """
+        self.batch_id: str = batch_id
+        self.path: str = path
+        # En-tête du lot (options, fichiers, export_path, zip_path)
+        self.header: Dict[str, Any] = {}
+        # Dernier état connu de chaque image : {old_path: {"state": str, "old_size": int, ...}}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Événements de lot déjà enregistrés
+        self.events: List[str] = []
+        # Fichier journal ouvert en ajout (ouvert à la première écriture)
+        self._file: Optional[io.TextIOWrapper] = None
+
+    @classmethod
+    def journal_path(cls, batch_id: str) -> str:
+        """Retourne le chemin complet du journal d'un lot."""
+        return get_writable_path(f"{cls.JOURNAL_DIR}/{batch_id}.jsonl")
+
+    @classmethod
+    def create(cls, options: Dict[str, Any], files: List[str], export_path: str,
+               zip_path: Optional[str] = None) -> "BatchJournal":
+        """
+        Crée le journal d'un nouveau lot et y écrit son en-tête.
+
+        Args:
+            options: Options complètes de l'exportation.
+            files: Chemins des images du lot.
+            export_path: Dossier d'exportation.
+            zip_path: Chemin du fichier ZIP du lot (None si pas d'export ZIP).
+
+        Returns:
+            Le journal créé.
+        """
+        batch_id: str = uuid.uuid4().hex
+        journal: BatchJournal = cls(batch_id, cls.journal_path(batch_id))
+        journal.header = {
+            "event": "batch",
+            "batch_id": batch_id,
+            "options": options,
+            "files": files,
+            "export_path": export_path,
+            "zip_path": zip_path,
+        }
+        journal._append(journal.header)
+        return journal
+
+    @classmethod
+    def open(cls, batch_id: str, lock: bool = False) -> "BatchJournal":
+        """
+        Relit le journal d'un lot existant pour le reprendre.
+        Une dernière ligne tronquée (arrêt brutal pendant l'écriture) est ignorée.
+
+        Args:
+            batch_id: Identifiant du lot.
+            lock: Si True, prend le verrou du journal avant de le relire (reprise du lot).
+
+        Returns:
+            Le journal avec l'état reconstruit de chaque image.
+
+        Raises:
+            FileNotFoundError: Si aucun journal n'existe pour ce lot.
+            BlockingIOError: Si lock est demandé et que le lot est en cours dans un autre processus.
+            ValueError: Si le journal ne commence pas par un en-tête de lot.
+        """
+        journal: BatchJournal = cls(batch_id, cls.journal_path(batch_id))
+        if lock:
+            if not os.path.exists(journal.path):
+                raise FileNotFoundError(journal.path)
+            journal.acquire()
+        with io.open(journal.path, mode="r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record: Dict[str, Any] = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.error(f"Ligne de journal illisible ignorée ({batch_id})")
+                    continue
+
+                event: Optional[str] = record.get("event")
+                if event == "batch":
+                    journal.header = record
+                elif event:
+                    journal.events.append(event)
+                elif "path" in record:
+                    # Fusionne les champs successifs (tailles, sortie...) de l'image
+                    entry: Dict[str, Any] = journal.entries.setdefault(record["path"], {})
+                    entry.update({k: v for k, v in record.items() if k not in ("path", "t")})
+
+        if not journal.header:
+            journal.close()
+            raise ValueError(f"Journal de lot invalide: {journal.path}")
+        return journal
+
+    @staticmethod
+    def is_locked(path: str) -> bool:
+        """Indique si le journal est verrouillé par un lot en cours (dans ce processus ou un autre)."""
+        if fcntl is None:
+            return False
+        try:
+            with io.open(path, mode="r", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                # Verrou obtenu : aucun lot ne l'a ; il est libéré à la fermeture du fichier
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    @classmethod
+    def unfinished(cls, export_path: Optional[str] = None) -> List[str]:
+        """
+        Retourne les identifiants des lots interrompus : journal sans événement "completed",
+        et non verrouillé par un lot en cours. Les journaux de lots terminés rencontrés
+        (suppression interrompue) sont supprimés.
+
+        Args:
+            export_path: Si fourni, seuls les lots exportant vers ce dossier sont retournés.
+
+        Returns:
+            Les identifiants des lots à reprendre.
+        """
+        journal_dir: str = os.path.dirname(cls.journal_path("_"))
+        batch_ids: List[str] = []
+        for entry in os.scandir(journal_dir):
+            if not entry.name.endswith(".jsonl"):
+                continue
+            batch_id: str = entry.name[:-len(".jsonl")]
+            try:
+                if cls.is_locked(entry.path):
+                    continue
+                journal: BatchJournal = cls.open(batch_id)
+                if cls.COMPLETED in journal.events:
+                    journal.discard()
+                elif export_path is None or journal.header.get("export_path") == export_path:
+                    batch_ids.append(batch_id)
+            # Journal supprimé entre-temps (lot terminé par un autre processus) ou illisible
+            except (OSError, ValueError):
+                continue
+        return batch_ids
+
+    def record(self, path: str, state: str, **fields: Any) -> None:
+        """
+        Enregistre (de manière durable) le nouvel état d'une image.
+
+        Args:
+            path: Chemin de l'image originale.
+            state: Nouvel état (WRITTEN, ZIPPED, SKIPPED, ORIGINAL_DELETED).
+            **fields: Champs complémentaires (tailles, chemin de sortie...).
+        """
+        self._append({"t": time.time(), "path": path, "state": state, **fields})
+        self.entries.setdefault(path, {}).update(state=state, **fields)
+
+    def mark(self, event: str) -> None:
+        """
+        Enregistre (de manière durable) un événement du lot.
+
+        Args:
+            event: Nom de l'événement (ZIP_CLOSED, COMPLETED).
+        """
+        self._append({"t": time.time(), "event": event})
+        self.events.append(event)
+
+    def state_of(self, path: str) -> Optional[str]:
+        """Retourne le dernier état enregistré d'une image, ou None si elle n'a pas été traitée."""
+        return self.entries.get(path, {}).get("state")
+
+    def acquire(self) -> None:
+        """
+        Ouvre le journal en ajout et prend son verrou exclusif, gardé jusqu'à close().
+        Sans effet si le journal est déjà ouvert par cet objet.
+
+        Raises:
+            BlockingIOError: Si le lot est en cours dans un autre processus (ou un autre objet).
+        """
+        if self._file is not None:
+            return
+        journal_file: io.TextIOWrapper = io.open(self.path, mode="a", encoding="utf-8")
+        if fcntl:
+            try:
+                fcntl.flock(journal_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                journal_file.close()
+                raise
+        self._file = journal_file
+
+    def close(self) -> None:
+        """Ferme le fichier journal et libère son verrou (il sera repris en cas de nouvelle écriture)."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Supprime le journal d'un lot terminé (avant de libérer son verrou), puis le ferme."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.close()
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Ajoute une ligne au journal puis la force sur le disque (verrou pris à la première écriture)."""
+        self.acquire()
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
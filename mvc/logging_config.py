@@ -0,0 +1,211 @@
+import json
+import queue
+import atexit
+import logging
+import itertools
+import logging.handlers
+from typing import Dict, Any, List, Optional
+
+from utils import get_writable_path
+
+logger = logging.getLogger(__name__)
+
+
+# Chemins RELATIFS des journaux (à côté de l'exécutable)
+LOG_FILE: str = "logs/application.log"     # Messages lisibles
+EVENTS_FILE: str = "logs/events.jsonl"     # Événements structurés, un objet JSON par ligne
+
+# Rotation : taille maximale d'un fichier et nombre d'archives conservées
+MAX_BYTES: int = 5 * 1024 * 1024
+BACKUP_COUNT: int = 5
+
+# Part des événements structurés conservés pour chaque niveau (1.0 = tous) ;
+# les messages simples (sans événement) ne sont jamais échantillonnés
+DEFAULT_SAMPLE_RATES: Dict[int, float] = {
+    logging.DEBUG: 0.01,
+    logging.INFO: 1.0,
+    logging.WARNING: 1.0,
+    logging.ERROR: 1.0,
+    logging.CRITICAL: 1.0,
+}
+
+# Écouteur du processus courant et gestionnaires de fichiers (une seule configuration par processus)
+_listener: Optional[logging.handlers.QueueListener] = None
+_file_handlers: List[logging.Handler] = []
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Échantillonne les événements structurés par niveau : pour un taux de 0.01, un événement
+    sur cent est conservé. Le comptage est déterministe (pas de tirage aléatoire) et ne coûte
+    qu'un incrément ; il est appliqué avant la mise en file pour que les événements écartés
+    ne coûtent rien de plus.
+    """
+
+    def __init__(self, sample_rates: Dict[int, float]) -> None:
+        """
+        Args:
+            sample_rates: Taux de conservation par niveau (les niveaux absents sont tous conservés).
+        """
+        super().__init__()
+        # Conserve un événement sur "period" pour chaque niveau (0 = aucun)
+        self.periods: Dict[int, int] = {
+            level: round(1 / rate) if rate > 0 else 0 for level, rate in sample_rates.items()
+        }
+        self.counters: Dict[int, Any] = {level: itertools.count() for level in sample_rates}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "event"):
+            return True
+        period: Optional[int] = self.periods.get(record.levelno)
+        if period is None or period == 1:
+            return True
+        if period == 0:
+            return False
+        return next(self.counters[record.levelno]) % period == 0
+
+
+class EventFilter(logging.Filter):
+    """Ne laisse passer que les enregistrements portant (ou non, si exclude) un événement structuré."""
+
+    def __init__(self, exclude: bool = False) -> None:
+        super().__init__()
+        self.exclude: bool = exclude
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return hasattr(record, "event") != self.exclude
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formate un événement structuré en une ligne JSON (horodatage, niveau, logger, étape et champs)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "t": round(record.created, 3),
+                "level": record.levelname,
+                "logger": record.name,
+                "stage": record.getMessage(),
+                **record.event,
+            },
+            ensure_ascii=False,
+            default=str,
+        )
+
+
+def _build_file_handlers(log_file: str, events_file: str, rotate: bool) -> List[logging.Handler]:
+    """Crée les gestionnaires (à rotation, si rotate) : messages lisibles et événements structurés."""
+    # maxBytes=0 : pas de rotation
+    max_bytes: int = MAX_BYTES if rotate else 0
+    text_handler: logging.Handler = logging.handlers.RotatingFileHandler(
+        get_writable_path(log_file), maxBytes=max_bytes, backupCount=BACKUP_COUNT, encoding="utf-8"
+    )
+    text_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+    text_handler.addFilter(EventFilter(exclude=True))
+
+    events_handler: logging.Handler = logging.handlers.RotatingFileHandler(
+        get_writable_path(events_file), maxBytes=max_bytes, backupCount=BACKUP_COUNT, encoding="utf-8"
+    )
+    events_handler.setFormatter(JsonLinesFormatter())
+    events_handler.addFilter(EventFilter())
+    return [text_handler, events_handler]
+
+
+def _install_queue_handler(log_queue: Any, level: int, sample_rates: Dict[int, float]) -> None:
+    """Remplace les gestionnaires du logger racine par un unique QueueHandler (non bloquant)."""
+    queue_handler: logging.handlers.QueueHandler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root: logging.Logger = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    # Les messages DEBUG de Pillow (décodage des blocs PNG...) noieraient les journaux
+    logging.getLogger("PIL").setLevel(max(level, logging.INFO))
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    sample_rates: Optional[Dict[int, float]] = None,
+    log_file: str = LOG_FILE,
+    events_file: str = EVENTS_FILE,
+    rotate: bool = True
+) -> None:
+    """
+    Configure la journalisation du processus principal : les threads de l'application ne font
+    que déposer leurs enregistrements dans une file, et un thread d'écoute (QueueListener) les
+    écrit sur le disque, avec rotation des fichiers. Sans effet si elle est déjà configurée.
+
+    Un seul processus doit écrire (et faire tourner) une paire de fichiers : les processus
+    indépendants d'un même traitement (shards) reçoivent chacun leurs propres fichiers.
+
+    Args:
+        level: Niveau minimal journalisé (logging.DEBUG active les événements par étape).
+        sample_rates: Taux de conservation des événements structurés par niveau (DEFAULT_SAMPLE_RATES sinon).
+        log_file: Fichier des messages lisibles (relatif à l'exécutable, ou absolu).
+        events_file: Fichier des événements structurés (relatif à l'exécutable, ou absolu).
+        rotate: Si False, les fichiers ne sont jamais renommés (fichiers propres à un processus de courte durée).
+    """
+    global _listener, _file_handlers
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _file_handlers = _build_file_handlers(log_file, events_file, rotate)
+    _listener = logging.handlers.QueueListener(log_queue, *_file_handlers, respect_handler_level=True)
+    _listener.start()
+    # Vide la file à la fermeture de l'application
+    atexit.register(_listener.stop)
+
+    _install_queue_handler(log_queue, level, sample_rates or DEFAULT_SAMPLE_RATES)
+
+
+def listen(log_queue: Any) -> logging.handlers.QueueListener:
+    """
+    Écrit dans les fichiers du processus principal les enregistrements d'une file partagée
+    avec des processus de travail (voir setup_worker_logging). setup_logging() doit avoir été appelé.
+
+    Args:
+        log_queue: File multiprocessing alimentée par les processus de travail.
+
+    Returns:
+        L'écouteur démarré (à arrêter avec stop() à la fermeture du pool).
+    """
+    listener: logging.handlers.QueueListener = logging.handlers.QueueListener(
+        log_queue, *_file_handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
+def setup_worker_logging(
+    log_queue: Any,
+    level: int = logging.INFO,
+    sample_rates: Optional[Dict[int, float]] = None
+) -> None:
+    """
+    Configure la journalisation d'un processus de travail : ses enregistrements sont envoyés
+    au processus principal, seul à écrire (et faire tourner) les fichiers de journaux.
+
+    Args:
+        log_queue: File multiprocessing lue par le processus principal (voir listen()).
+        level: Niveau minimal journalisé.
+        sample_rates: Taux de conservation des événements structurés par niveau.
+    """
+    _install_queue_handler(log_queue, level, sample_rates or DEFAULT_SAMPLE_RATES)
+
+
+def log_event(target: logging.Logger, stage: str, level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Journalise un événement structuré (écrit dans logs/events.jsonl).
+
+    Args:
+        target: Le logger émetteur.
+        stage: Nom de l'étape ou de l'événement (ex: "image", "encode", "batch").
+        level: Niveau de l'événement (soumis à l'échantillonnage de ce niveau).
+        **fields: Champs de l'événement (batch_id, file, duration_ms, bytes...), sérialisables en JSON.
+    """
+    # Test du niveau avant toute construction d'enregistrement : un événement désactivé ne coûte rien
+    if target.isEnabledFor(level):
+        target.log(level, stage, extra={"event": fields})
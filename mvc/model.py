@@ -2,26 +2,34 @@ import os
 import io
 import json
 import uuid 
+import time
+import shutil
 import logging
 import pathlib
-from zipfile import ZipFile, ZIP_DEFLATED
-from typing import Dict, Any, Tuple, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple, List, Optional, Callable, TYPE_CHECKING
 
 from PIL import Image
 
 from utils import get_writable_path
+from .journal import BatchJournal, fsync_path, fsync_directory
+from .encoders import EncoderBackend, get_encoder
+from .presets import PRESETS, classify_image
+from .resize import ResizeEngine
+from .color import ColorConverter, INTENTS, parse_color, has_alpha, flatten_alpha
+from .logging_config import log_event
 
-# --- Configuration du logger ---
-# Utilise get_writable_path pour que le fichier log soit toujours créé à côté de l'exécutable
-LOG_FILE_PATH = get_writable_path("logs/application.log")
+if TYPE_CHECKING:
+    # zipfile n'est importé qu'au premier export (voir process_and_export)
+    from zipfile import ZipFile
 
+# --- Logger ---
+# La destination (logs/application.log, logs/events.jsonl) est configurée par le point d'entrée
+# via mvc.logging_config.setup_logging() : écriture non bloquante, par un thread dédié
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    filename=LOG_FILE_PATH, # ⬅️ UTILISATION DU CHEMIN FIABLE
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s"
-)
-# -----------------------------------------------------
+
+# Étapes chronométrées d'une image (champs "<étape>_ms" du résultat), journalisées au niveau DEBUG
+TIMED_STAGES: Tuple[str, ...] = ("decode", "convert", "analyze", "resize", "encode", "write")
 
 class ApplicationModel:
     """
@@ -32,17 +40,83 @@ class ApplicationModel:
 
     # Nom et chemin RELATIF du fichier de configuration pour la persistance
     CONFIG_FILE: str = "settings/export_folder.json"
+    # Nom et chemin RELATIF du fichier des dernières options d'exportation (réutilisées par watch.py)
+    OPTIONS_FILE: str = "settings/export_options.json"
+
+    # Options acceptées par process_and_export et leurs valeurs par défaut.
+    # Sert de schéma commun au Contrôleur (handle_export_images) et au service local (service.py).
+    DEFAULT_OPTIONS: Dict[str, Any] = {
+        'quality': 80,
+        'resize_factor': 1.0,
+        'output_format': 'JPG',
+        'add_suffixe': False,
+        'use_zip': False,
+        'delete_originals': False,
+        'optimized_encoding': False,
+        'progressive_loading': False,
+        'strip_metadata': False,
+        # Mode "Stockage optimisé" : format, qualité et effort choisis pour chaque image selon son contenu
+        'content_aware': False,
+        # Effort d'encodage (0 = le plus rapide, 50 = réglage par défaut du codec, 100 = les plus petits fichiers)
+        'effort': 50,
+        # Déclinaisons multiples (ex: [{"width": 1280, "output_format": "WEBP"}, ...]) ; vide = sortie unique
+        'renditions': [],
+        # Gain minimal (en % de la taille originale) qu'une sortie doit apporter pour être écrite
+        'min_gain_percent': 0.0,
+        # Sortie sans gain suffisant : "keep" (publie l'original à la place), "skip" (aucune sortie,
+        # l'original est conservé) ou "write" (écrit tout de même la sortie ré-encodée)
+        'no_gain_policy': 'keep',
+        # Compromis vitesse/qualité du redimensionnement : "fast", "balanced" ou "best" (voir ResizeEngine)
+        'resize_quality': 'balanced',
+        # Conversion en sRGB des images portant un profil ICC (espace large, CMJN), transformations en cache
+        'color_management': True,
+        # Intention de rendu des conversions ICC : "perceptual", "relative", "saturation" ou "absolute"
+        'rendering_intent': 'perceptual',
+        # Couleur de fond sur laquelle la transparence est aplatie pour les formats sans alpha (ex: JPEG)
+        'background_color': '#FFFFFF',
+    }
+
+    # Valeurs acceptées pour l'option 'no_gain_policy'
+    NO_GAIN_POLICIES: Tuple[str, ...] = ("keep", "skip", "write")
+
+    # Colonnes du rapport par fichier (résultats de process_and_export, export CSV/JSON).
+    # Statuts : "ok", "kept" (original publié faute de gain), "partial" (déclinaisons sans gain ignorées),
+    # "skipped" (aucune sortie, faute de gain), "resumed" (terminé lors d'une exécution précédente), "error"
+    REPORT_FIELDS: List[str] = [
+        "file", "status", "error", "in_bytes", "out_bytes", "gain_percent",
+        "width", "height", "out_width", "out_height", "format", "quality", "preset",
+        "decode_ms", "convert_ms", "analyze_ms", "resize_ms", "encode_ms", "write_ms", "total_ms",
+    ]
+
+    # Clés acceptées dans une déclinaison de l'option 'renditions' et leurs types
+    RENDITION_KEYS: Dict[str, type] = {
+        'output_format': str,
+        'width': int,
+        'resize_factor': float,
+        'quality': int,
+        'effort': int,
+        'label': str,
+    }
     
-    def __init__(self) -> None:
+    def __init__(self, setup_export: bool = True) -> None:
+        """
+        Args:
+            setup_export: Si False, la lecture du chemin d'exportation persistant est laissée
+                à l'appelant (setup_export_path()), par exemple après l'affichage de la fenêtre.
+        """
         # Dictionnaire pour stocker les informations et l'objet PIL de chaque image sélectionnée.
         # Structure: {id: {"old_path": str, "old_name": str, "old_size": int, "image_obj": Image.Image, ...}}
         self.data: Dict[int, Dict[str, Any]] = {} 
         
         # Le chemin de destination des fichiers exportés
         self.export_path: str = ""
+
+        # Résultats par fichier du dernier export (voir REPORT_FIELDS), pour le rapport
+        self.last_results: List[Dict[str, Any]] = []
         
         # Initialise le chemin d'exportation persistant ou utilise le chemin par défaut
-        self.setup_export_path()
+        if setup_export:
+            self.setup_export_path()
 
     # --- Persistance (lecture/écriture du chemin d'exportation) ---
 
@@ -90,6 +164,41 @@ class ApplicationModel:
             # Log de l'erreur en cas d'échec de l'écriture
             logger.error(f"Erreur lors de l'écriture de la configuration: {e}")
             
+    def read_options(self) -> Dict[str, Any]:
+        """
+        Lit les dernières options d'exportation sauvegardées.
+
+        Returns:
+            Les options complètes (fusionnées avec DEFAULT_OPTIONS), ou DEFAULT_OPTIONS si
+            le fichier n'existe pas, est corrompu ou ne respecte plus le schéma.
+        """
+        try:
+            options_full_path: str = get_writable_path(self.OPTIONS_FILE)
+            with io.open(file=options_full_path, mode="r", encoding="utf-8") as f:
+                saved_options: Any = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return dict(self.DEFAULT_OPTIONS)
+
+        error_msg: Optional[str] = self.validate_options(saved_options)
+        if error_msg:
+            logger.error(f"Options sauvegardées ignorées: {error_msg}")
+            return dict(self.DEFAULT_OPTIONS)
+        return {**self.DEFAULT_OPTIONS, **saved_options}
+
+    def write_options(self, options: Dict[str, Any]) -> None:
+        """
+        Sauvegarde les options d'exportation (pour le mode surveillance de dossier, watch.py).
+
+        Args:
+            options: Les options d'exportation (schéma DEFAULT_OPTIONS).
+        """
+        try:
+            options_full_path: str = get_writable_path(self.OPTIONS_FILE)
+            with io.open(file=options_full_path, mode="w", encoding="utf-8") as f:
+                json.dump(obj=options, fp=f, ensure_ascii=False, indent=1)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture des options: {e}")
+
     def setup_export_path(self) -> None:
         """
         Détermine le chemin d'exportation à utiliser : le chemin sauvegardé, 
@@ -137,8 +246,10 @@ class ApplicationModel:
             try:
                 # Ouvre l'image avec Pillow (gestion des formats divers)
                 img: Image.Image = Image.open(f)
-                # Obtient la taille originale du fichier sur le disque
-                old_size: int = os.path.getsize(file)
+                # Obtient la taille originale via le descripteur déjà ouvert par Pillow (un seul fstat,
+                # sans nouvelle résolution du chemin, coûteuse sur un système de fichiers réseau)
+                fp: Any = getattr(img, 'fp', None)
+                old_size: int = os.fstat(fp.fileno()).st_size if fp is not None else os.path.getsize(file)
                 
                 # Stockage des informations dans le dictionnaire de données
                 self.data[i] = {
@@ -171,79 +282,535 @@ class ApplicationModel:
                 # Ignore l'erreur si l'objet est déjà fermé ou non valide
                 pass
         
-        # Vide le dictionnaire de données
+        # Vide le dictionnaire de données et le rapport du dernier export
         self.data.clear()
+        self.last_results = []
         
         # S'assure que le chemin d'exportation est à jour (au cas où il ait été perdu)
         self.setup_export_path()
 
     # --- Logique de Compression et Exportation ---
 
-    def process_and_export(self, options: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    def resume_batch(
+        self,
+        batch_id: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Reprend un lot interrompu à partir de son journal : recharge les images du lot,
+        restaure ses options et son dossier d'export, puis ignore le travail déjà terminé.
+
+        Args:
+            batch_id: Identifiant du lot (voir BatchJournal.unfinished()).
+            progress_callback: Voir process_and_export.
+
+        Returns:
+            Le même tuple que process_and_export.
+        """
+        try:
+            # Le verrou est pris avant la relecture et gardé jusqu'à la fin de la reprise
+            journal: BatchJournal = BatchJournal.open(batch_id, lock=True)
+        except BlockingIOError:
+            return 0, {"error_msg": f"Le lot {batch_id} est en cours de traitement par un autre processus."}
+        except (OSError, ValueError) as e:
+            return 0, {"error_msg": f"Journal de lot introuvable ou invalide: {e}"}
+
+        if BatchJournal.COMPLETED in journal.events:
+            journal.close()
+            return 0, {"error_msg": f"Le lot {batch_id} est déjà terminé."}
+
+        # Recharge uniquement les originaux encore présents (les autres ont été exportés puis supprimés)
+        files: List[str] = [
+            f for f in journal.header["files"] if journal.state_of(f) != BatchJournal.ORIGINAL_DELETED
+        ]
+        self.reset_data()
+        self.load_images(files)
+        self.export_path = journal.header["export_path"]
+
+        return self.process_and_export(journal.header["options"], progress_callback, journal=journal)
+
+    def _delete_original(self, item: Dict[str, Any], journal: BatchJournal) -> None:
+        """
+        Supprime l'original d'une image dont la sortie est durablement écrite, et l'enregistre au journal.
+
+        Args:
+            item: L'entrée de self.data correspondant à l'image.
+            journal: Le journal du lot en cours.
+        """
+        item["image_obj"].close() # Fermeture explicite
+        os.remove(item["old_path"])
+        journal.record(item["old_path"], BatchJournal.ORIGINAL_DELETED)
+        logger.info(f"Original '{item['old_path']}' supprimé")
+
+    @classmethod
+    def _build_renditions(cls, options: Dict[str, Any]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Normalise les déclinaisons à produire pour chaque image. Sans déclinaison explicite
+        (option 'renditions' vide), une seule sortie est décrite par les options classiques
+        et le nom des fichiers exportés est inchangé.
+
+        Args:
+            options: Options complètes (fusionnées avec DEFAULT_OPTIONS).
+
+        Returns:
+            Un tuple (message d'erreur ou None, liste des déclinaisons normalisées).
+        """
+        specs: List[Dict[str, Any]] = options['renditions'] or [
+            {'output_format': options['output_format'], 'resize_factor': options['resize_factor'], 'label': ''}
+        ]
+
+        renditions: List[Dict[str, Any]] = []
+        for spec in specs:
+            output_format: str = spec.get('output_format', options['output_format']).upper()
+            # Encodeur du registre (uniquement parmi ceux détectés dans l'installation de Pillow)
+            encoder: Optional[EncoderBackend] = get_encoder(output_format)
+            if encoder is None:
+                return f"Format de sortie non supporté: {output_format}", []
+
+            width: Optional[int] = spec.get('width')
+            resize_factor: float = spec.get('resize_factor', 1.0 if width else options['resize_factor'])
+            # Libellé utilisé comme suffixe de fichier (ex: "photo_1280w.webp")
+            label: str = spec.get('label', f"{width}w" if width else f"{round(resize_factor * 100)}pct")
+            extension: str = output_format.lower()
+
+            # --- Paramètres de sauvegarde de Pillow (traduits par l'encodeur) ---
+            quality: int = spec.get('quality', options['quality'])
+            pillow_params: Dict[str, Any] = encoder.build_params(quality, spec.get('effort', options['effort']), options)
+
+            renditions.append({
+                "name": f"{label}.{extension}" if label else extension,   # Clé unique dans les statistiques
+                "encoder": encoder,
+                "quality": quality,
+                "extension": extension,
+                "width": width,
+                "resize_factor": resize_factor,
+                "filename_suffix": f"_{label}" if label else "",
+                "pillow_params": pillow_params,
+                # Fond de l'aplatissement de la transparence (formats sans alpha)
+                "background": parse_color(options['background_color']),
+            })
+
+        if len({r["name"] for r in renditions}) != len(renditions):
+            return "Plusieurs déclinaisons produiraient le même nom de fichier.", []
+        return None, renditions
+
+    @staticmethod
+    def _target_size(source_size: Tuple[int, int], rendition: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Calcule les dimensions d'une déclinaison (sans jamais agrandir l'image source).
+
+        Args:
+            source_size: Les dimensions (largeur, hauteur) de l'image source en pleine résolution.
+            rendition: La déclinaison normalisée (largeur cible ou facteur de redimensionnement).
+
+        Returns:
+            Les dimensions (largeur, hauteur) de la déclinaison.
+        """
+        source_width, source_height = source_size
+        if rendition["width"]:
+            width: int = min(rendition["width"], source_width)
+            return width, max(1, round(source_height * width / source_width))
+
+        resize_factor: float = rendition["resize_factor"]
+        if resize_factor < 1.0 and resize_factor > 0:
+            # Calcul des nouvelles dimensions
+            new_width: int = int(source_width * resize_factor)
+            new_height: int = int(source_height * resize_factor)
+            if new_width > 0 and new_height > 0:
+                return new_width, new_height
+        return source_size
+
+    @staticmethod
+    def _resize_cascade(
+        img: Image.Image,
+        sizes: List[Tuple[int, int]],
+        engine: ResizeEngine
+    ) -> Dict[Tuple[int, int], Image.Image]:
+        """
+        Produit une image par taille demandée, de la plus grande à la plus petite : chaque
+        réduction part de la plus proche image intermédiaire plus grande, et non de l'originale.
+
+        Args:
+            img: L'image source décodée (éventuellement déjà réduite au décodage, voir ResizeEngine.draft).
+            sizes: Les dimensions demandées (doublons possibles).
+            engine: Le moteur de redimensionnement (filtre et stratégie selon l'échelle).
+
+        Returns:
+            Un dictionnaire {dimensions: image redimensionnée} (l'image source pour ses propres dimensions).
+        """
+        images: Dict[Tuple[int, int], Image.Image] = {img.size: img}
+        current: Image.Image = img
+        for size in sorted(set(sizes), key=lambda s: s[0] * s[1], reverse=True):
+            if size not in images:
+                # Redimensionnement (filtre et réduction préalable choisis par le moteur selon l'échelle)
+                images[size] = engine.resize(current, size)
+            current = images[size]
+        return images
+
+    @staticmethod
+    def _encode_rendition(img: Image.Image, rendition: Dict[str, Any], buffer: io.BytesIO) -> memoryview:
+        """
+        Encode une déclinaison en mémoire (exécuté en parallèle dans le pool d'encodage).
+
+        Args:
+            img: L'image aux dimensions de la déclinaison.
+            rendition: La déclinaison normalisée (encodeur et paramètres Pillow).
+            buffer: Tampon réutilisé d'une image à l'autre (sa vue précédente doit avoir été libérée).
+
+        Returns:
+            Une vue (sans copie) sur le contenu encodé ; sa longueur est la taille du fichier.
+            Elle doit être libérée (release()) avant la réutilisation du tampon.
+        """
+        encoder: EncoderBackend = rendition["encoder"]
+        # --- Transparence : aplatie sur la couleur de fond si le format ne la gère pas ---
+        if not encoder.supports_alpha and has_alpha(img):
+            img = flatten_alpha(img, rendition["background"])
+        # --- Conversion de mode (propre au codec) ---
+        img = encoder.prepare(img, rendition["quality"])
+
+        # Réécrit le tampon depuis le début : son allocation est conservée d'une image à l'autre
+        buffer.seek(0)
+        img.save(buffer, format=encoder.pillow_format, **rendition["pillow_params"])
+        buffer.truncate()
+        return buffer.getbuffer()
+
+    @staticmethod
+    def _link_or_copy(source: str, destination: pathlib.Path) -> None:
+        """
+        Reproduit l'original à l'emplacement donné (politique sans gain "keep") : par un lien
+        physique lorsque c'est possible (aucune donnée recopiée), sinon par une copie synchronisée.
+
+        Args:
+            source: Chemin du fichier original.
+            destination: Chemin (temporaire) de la copie à créer.
+        """
+        try:
+            os.link(source, destination)
+        except OSError:
+            # Autre système de fichiers ou liens non supportés : copie classique
+            shutil.copyfile(source, destination)
+            fsync_path(str(destination))
+
+    @staticmethod
+    def _log_result(batch_id: str, result: Dict[str, Any]) -> None:
+        """
+        Journalise le résultat d'une image comme événement structuré, et ses étapes
+        chronométrées au niveau DEBUG (échantillonné).
+
+        Args:
+            batch_id: Identifiant du lot.
+            result: Le résultat de l'image (voir REPORT_FIELDS).
+        """
+        log_event(
+            logger, "image", level=logging.ERROR if result["status"] == "error" else logging.INFO,
+            batch_id=batch_id, file=result["file"], status=result["status"], duration_ms=result["total_ms"],
+            in_bytes=result["in_bytes"], out_bytes=result["out_bytes"], error=result["error"] or None
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            for stage in TIMED_STAGES:
+                if result[f"{stage}_ms"] != "":
+                    log_event(
+                        logger, stage, level=logging.DEBUG,
+                        batch_id=batch_id, file=result["file"], duration_ms=result[f"{stage}_ms"]
+                    )
+
+    @staticmethod
+    def _elapsed_ms(start: float) -> float:
+        """Retourne le temps écoulé depuis start (time.perf_counter()) en millisecondes."""
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    @classmethod
+    def _resumed_result(cls, path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Construit le résultat d'une image terminée lors d'une exécution précédente du lot.
+
+        Args:
+            path: Chemin de l'image originale.
+            entry: L'état de l'image reconstruit depuis le journal.
+
+        Returns:
+            Le résultat (voir REPORT_FIELDS), sans mesures de temps.
+        """
+        result: Dict[str, Any] = {field: "" for field in cls.REPORT_FIELDS}
+        result.update(
+            file=path, status="skipped" if entry.get("state") == BatchJournal.SKIPPED else "resumed", in_bytes=entry["old_size"], out_bytes=entry["new_size"],
+            gain_percent=round((1 - entry["new_size"] / entry["old_size"]) * 100, 1) if entry["old_size"] else 0.0,
+            format=", ".join(entry.get("renditions", {})), preset=entry.get("preset") or ""
+        )
+        return result
+
+    def export_report(self, path: str) -> bool:
+        """
+        Exporte le rapport par fichier du dernier export, en CSV ou en JSON selon l'extension.
+
+        Args:
+            path: Chemin du fichier de rapport (.csv ou .json).
+
+        Returns:
+            True si le rapport a été écrit, False en cas d'erreur (journalisée).
+        """
+        import csv
+
+        try:
+            if path.lower().endswith(".json"):
+                with io.open(file=path, mode="w", encoding="utf-8") as f:
+                    json.dump(obj=self.last_results, fp=f, ensure_ascii=False, indent=1)
+            else:
+                # newline="" : le module csv gère lui-même les fins de ligne
+                with io.open(file=path, mode="w", encoding="utf-8", newline="") as f:
+                    writer: csv.DictWriter = csv.DictWriter(f, fieldnames=self.REPORT_FIELDS)
+                    writer.writeheader()
+                    writer.writerows(self.last_results)
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'export du rapport: {e}")
+            return False
+
+    @classmethod
+    def validate_options(cls, options: Dict[str, Any]) -> Optional[str]:
+        """
+        Vérifie qu'un dictionnaire d'options respecte le schéma de DEFAULT_OPTIONS
+        (clés connues, types compatibles, bornes de la qualité et du redimensionnement).
+
+        Args:
+            options: Le dictionnaire d'options à vérifier (provenant par exemple d'une requête JSON).
+
+        Returns:
+            Un message d'erreur (str) ou None si les options sont valides.
+        """
+        if not isinstance(options, dict):
+            return "Les options doivent être un objet JSON."
+
+        for key, value in options.items():
+            if key not in cls.DEFAULT_OPTIONS:
+                return f"Option inconnue: {key}"
+            expected_type: type = type(cls.DEFAULT_OPTIONS[key])
+            # Un entier est accepté pour un flottant (ex: resize_factor = 1), mais un booléen n'est pas un nombre ici
+            if expected_type is float and isinstance(value, int) and not isinstance(value, bool):
+                continue
+            if type(value) is not expected_type:
+                return f"Type invalide pour l'option '{key}' (attendu: {expected_type.__name__})"
+
+        if not (1 <= options.get('quality', cls.DEFAULT_OPTIONS['quality']) <= 100):
+            return "La qualité de compression doit être entre 1 et 100."
+        if not (0 < options.get('resize_factor', cls.DEFAULT_OPTIONS['resize_factor']) <= 1.0):
+            return "Le facteur de redimensionnement doit être dans l'intervalle ]0, 1]."
+        if not (0 <= options.get('effort', cls.DEFAULT_OPTIONS['effort']) <= 100):
+            return "L'effort d'encodage doit être entre 0 et 100."
+        if not (0 <= options.get('min_gain_percent', cls.DEFAULT_OPTIONS['min_gain_percent']) < 100):
+            return "Le gain minimal doit être dans l'intervalle [0, 100[."
+        if options.get('no_gain_policy', cls.DEFAULT_OPTIONS['no_gain_policy']) not in cls.NO_GAIN_POLICIES:
+            return f"Politique sans gain inconnue (attendu: {', '.join(cls.NO_GAIN_POLICIES)})"
+        if options.get('resize_quality', cls.DEFAULT_OPTIONS['resize_quality']) not in ResizeEngine.QUALITIES:
+            return f"Qualité de redimensionnement inconnue (attendu: {', '.join(ResizeEngine.QUALITIES)})"
+        if options.get('rendering_intent', cls.DEFAULT_OPTIONS['rendering_intent']) not in INTENTS:
+            return f"Intention de rendu inconnue (attendu: {', '.join(INTENTS)})"
+        try:
+            parse_color(options.get('background_color', cls.DEFAULT_OPTIONS['background_color']))
+        except ValueError:
+            return "Couleur de fond invalide (ex: \"#FFFFFF\")."
+
+        for spec in options.get('renditions', []):
+            if not isinstance(spec, dict):
+                return "Chaque déclinaison doit être un objet JSON."
+            for key, value in spec.items():
+                if key not in cls.RENDITION_KEYS:
+                    return f"Clé de déclinaison inconnue: {key}"
+                expected_type = cls.RENDITION_KEYS[key]
+                if expected_type is float and isinstance(value, int) and not isinstance(value, bool):
+                    continue
+                if type(value) is not expected_type:
+                    return f"Type invalide pour la clé de déclinaison '{key}' (attendu: {expected_type.__name__})"
+            if spec.get('width', 1) <= 0:
+                return "La largeur d'une déclinaison doit être positive."
+            if not (0 < spec.get('resize_factor', 1.0) <= 1.0):
+                return "Le facteur de redimensionnement doit être dans l'intervalle ]0, 1]."
+            if not (1 <= spec.get('quality', 80) <= 100):
+                return "La qualité de compression doit être entre 1 et 100."
+            if not (0 <= spec.get('effort', 50) <= 100):
+                return "L'effort d'encodage doit être entre 0 et 100."
+        return None
+
+    def process_and_export(
+        self,
+        options: Dict[str, Any],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        journal: Optional[BatchJournal] = None
+    ) -> Tuple[int, Dict[str, Any]]:
         """
         Applique les transformations (redimensionnement, conversion, compression) 
         aux images et les exporte vers la destination choisie.
 
         Args:
             options: Dictionnaire des options de compression et d'exportation lues depuis la Vue.
+            progress_callback: Fonction optionnelle appelée après chaque image avec
+                (nombre d'images traitées, nombre total d'images).
+            journal: Journal d'un lot interrompu à reprendre (voir resume_batch). Si None,
+                un nouveau journal est créé dans logs/journals/.
 
         Returns:
             Un tuple contenant (nombre de succès, dictionnaire de statistiques et d'erreurs).
         """
         
         # Vérification de sécurité : si les données sont vides ou le chemin d'exportation est invalide
-        if not self.data or not self.export_path or not os.path.isdir(self.export_path):
+        # (lors d'une reprise, toutes les images peuvent déjà être terminées et leurs originaux supprimés)
+        if (not self.data and journal is None) or not self.export_path or not os.path.isdir(self.export_path):
             return 0, {"error_msg": "Données manquantes ou chemin d'exportation invalide."} 
         
-        # 1. Extraction et typage des options
-        quality: int = options.get('quality', 80)
-        resize_factor: float = options.get('resize_factor', 1.0)
-        output_format: str = options.get('output_format', 'JPG').upper() 
-        add_suffixe: bool = options.get('add_suffixe', False) 
-        use_zip: bool = options.get('use_zip', False)
-        delete_originals: bool = options.get('delete_originals', False)
-        optimized_encoding: bool = options.get('optimized_encoding', False)
-        progressive_loading: bool = options.get('progressive_loading', False)
-        strip_metadata: bool = options.get('strip_metadata', False)
-
-        # Détermine le format de sauvegarde interne de Pillow
-        save_format_key: str
-        if output_format in ["JPG", "JPEG"]:
-            save_format_key = "jpeg" 
-        elif output_format == "WEBP":
-            save_format_key = "webp"
-        else:
-            # Si le format n'est pas supporté (sécurité)
-            return 0, {"error_msg": f"Format de sortie non supporté: {output_format}"} 
+        # 1. Extraction et typage des options (les valeurs absentes reprennent DEFAULT_OPTIONS)
+        options = {**self.DEFAULT_OPTIONS, **options}
+        add_suffixe: bool = options['add_suffixe'] 
+        resize_engine: ResizeEngine = ResizeEngine(options['resize_quality'])
+        # Conversion des couleurs (transformations ICC partagées par toutes les images du lot)
+        color_converter: Optional[ColorConverter] = (
+            ColorConverter(options['rendering_intent']) if options['color_management'] else None
+        )
+        use_zip: bool = options['use_zip']
+        delete_originals: bool = options['delete_originals']
+        no_gain_policy: str = options['no_gain_policy']
+        min_gain_percent: float = options['min_gain_percent']
+
+        # Détermine les déclinaisons (format, taille, qualité) à produire pour chaque image source
+        error_msg: Optional[str]
+        renditions: List[Dict[str, Any]]
+        error_msg, renditions = self._build_renditions(options)
+        if error_msg:
+            # Si un format n'est pas supporté (sécurité)
+            return 0, {"error_msg": error_msg}
 
-        # 2. Préparation des statistiques et du fichier ZIP
+        # Mode adapté au contenu : déclinaisons préparées pour chaque préréglage
+        # (un préréglage dont l'encodeur n'est pas disponible retombe sur les options choisies)
+        content_aware: bool = options['content_aware']
+        preset_renditions: Dict[str, List[Dict[str, Any]]] = {}
+        if content_aware:
+            for preset_name, preset in PRESETS.items():
+                preset_error: Optional[str]
+                preset_list: List[Dict[str, Any]]
+                preset_error, preset_list = self._build_renditions({**options, **preset})
+                preset_renditions[preset_name] = renditions if preset_error else preset_list
+
+        # 2. Préparation des statistiques, du journal de lot et du fichier ZIP
         total_old_size: int = 0
         total_new_size: int = 0
         success_count: int = 0 
-        zip_file: Optional[ZipFile] = None
+        # Nombre d'images déjà terminées lors d'une exécution précédente du lot (reprise)
+        resumed_count: int = 0
+        # Déclinaisons remplacées par l'original, et images sans aucune sortie (politique sans gain)
+        kept_count: int = 0
+        skipped_count: int = 0
+        zip_file: Optional["ZipFile"] = None
         zip_path: Optional[pathlib.Path] = None
+        resuming: bool = journal is not None
+
+        if use_zip:
+            if resuming and journal.header.get("zip_path"):
+                # Reprise : réutilise le fichier ZIP du lot interrompu
+                zip_path = pathlib.Path(journal.header["zip_path"])
+            else:
+                # Génère un nom de fichier ZIP unique
+                zip_filename: str = f"{uuid.uuid4()}.zip" 
+                # Chemin complet du fichier ZIP
+                zip_path = pathlib.Path(self.export_path) / zip_filename
+
+        # Création du journal du lot (append-only, synchronisé sur le disque à chaque ligne)
+        if journal is None:
+            journal = BatchJournal.create(
+                options=options,
+                files=[item["old_path"] for item in self.data.values()],
+                export_path=self.export_path,
+                zip_path=str(zip_path) if zip_path else None,
+            )
+
+        # Un ZIP n'est durable qu'une fois fermé : si le lot repris l'avait fermé, tout y est déjà
+        zip_closed: bool = use_zip and BatchJournal.ZIP_CLOSED in journal.events
         
         # Initialisation du fichier ZIP si l'option est activée
-        if use_zip:
-            # Génère un nom de fichier ZIP unique
-            zip_filename: str = f"{uuid.uuid4()}.zip" 
-            # Chemin complet du fichier ZIP
-            zip_path = pathlib.Path(self.export_path) / zip_filename
+        if use_zip and not zip_closed:
+            # Import différé : inutile au démarrage et pour les exports sans ZIP
+            from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
             try:
                  # Ouvre le fichier ZIP en mode écriture avec compression DEFLATE
+                 # (écrase un éventuel ZIP partiel, donc inutilisable, d'une exécution interrompue)
                  zip_file = ZipFile(zip_path, 'w', ZIP_DEFLATED)
             except Exception as e:
                 logger.error(f"Erreur lors de la création du fichier ZIP: {e}")
+                journal.close()
                 # Retourne l'erreur et le chemin du zip
                 return 0, {"error_msg": f"Erreur ZIP : {str(e)}", "zip_path": str(zip_path)}
+
+        # Images déjà terminées dont l'original a été supprimé : elles ne sont plus chargeables
+        # mais comptent dans les statistiques du lot repris
+        resumed_renditions: List[Dict[str, Any]] = []
+        # Résultat détaillé de chaque fichier (voir REPORT_FIELDS)
+        results: List[Dict[str, Any]] = []
+        if resuming:
+            loaded_paths: set = {item["old_path"] for item in self.data.values()}
+            for path, entry in journal.entries.items():
+                if path not in loaded_paths and entry.get("state") == BatchJournal.ORIGINAL_DELETED:
+                    total_old_size += entry["old_size"]
+                    total_new_size += entry["new_size"]
+                    success_count += 1
+                    resumed_count += 1
+                    resumed_renditions.append(entry)
+                    kept_count += len(entry.get("kept", []))
+                    results.append(self._resumed_result(path, entry))
+
+        # Originaux dont la suppression attend la fermeture durable du ZIP
+        pending_deletions: List[Dict[str, Any]] = []
+
+        # Statistiques par déclinaison : {nom: {"count": int, "new_size": int}}
+        rendition_stats: Dict[str, Dict[str, int]] = {}
+        # Nombre d'images par préréglage choisi (mode adapté au contenu)
+        preset_counts: Dict[str, int] = {}
+
+        # Tampons d'encodage, un par déclinaison, réutilisés pour toutes les images du lot
+        buffers: List[io.BytesIO] = []
+
+        # Les encodeurs de Pillow libèrent le GIL : les déclinaisons d'une image sont encodées en parallèle
+        encoder_pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=min(len(renditions), os.cpu_count() or 1))
         
         # 3. Traitement image par image
-        for item in self.data.values():
+        total_items: int = len(self.data)
+        for done_count, item in enumerate(self.data.values(), start=1):
             img: Image.Image = item["image_obj"]
             original_path: str = item["old_path"]
             temp_path: Optional[pathlib.Path] = None
+            item_start: float = time.perf_counter()
+            result: Dict[str, Any] = {field: "" for field in self.REPORT_FIELDS}
+            result.update(file=original_path, in_bytes=item["old_size"])
+            # Vues sur les tampons d'encodage de l'image (libérées après l'écriture)
+            encoded: List[memoryview] = []
             
             try:
+                # --- Reprise : image déjà terminée lors d'une exécution précédente ---
+                entry: Dict[str, Any] = journal.entries.get(original_path, {})
+                state: Optional[str] = entry.get("state")
+                if state == BatchJournal.SKIPPED:
+                    # Image sans gain déjà ignorée : rien n'a été écrit, l'original reste en place
+                    skipped_count += 1
+                    success_count += 1
+                    resumed_count += 1
+                    result = self._resumed_result(original_path, entry)
+                    continue
+                if use_zip:
+                    completed: bool = zip_closed and state in (BatchJournal.ZIPPED, BatchJournal.ORIGINAL_DELETED)
+                else:
+                    completed = state in (BatchJournal.WRITTEN, BatchJournal.ORIGINAL_DELETED) \
+                        and bool(entry.get("outputs")) and all(os.path.exists(p) for p in entry["outputs"])
+                if completed:
+                    total_old_size += entry["old_size"]
+                    total_new_size += entry["new_size"]
+                    success_count += 1
+                    resumed_count += 1
+                    resumed_renditions.append(entry)
+                    kept_count += len(entry.get("kept", []))
+                    result = self._resumed_result(original_path, entry)
+                    # La sortie est durable : l'original peut être supprimé s'il ne l'a pas encore été
+                    # (sauf s'il est encore nécessaire : déclinaison ignorée, ou sortie à sa place)
+                    if delete_originals and state != BatchJournal.ORIGINAL_DELETED and not entry.get("keep_original"):
+                        self._delete_original(item, journal)
+                    continue
+
                 # Vérifie si l'objet PIL est toujours ouvert/valide avant de le traiter
                 if getattr(img, 'fp', None) is None: 
                     img = Image.open(original_path)
@@ -251,69 +818,185 @@ class ApplicationModel:
                     
                 # Ajout de la taille originale pour le calcul final
                 total_old_size += item["old_size"]
+
+                # --- Décodage unique de la source (partagé par toutes les déclinaisons) ---
+                # Les dimensions cibles sont calculées sur la pleine résolution (connue avant le décodage),
+                # ce qui permet aux JPEG d'être décodés directement à l'échelle utile
+                stage_start: float = time.perf_counter()
+                source_size: Tuple[int, int] = img.size
+                resize_engine.draft(img, [self._target_size(source_size, r) for r in renditions])
+                img.load()
+                result.update(width=source_size[0], height=source_size[1], decode_ms=self._elapsed_ms(stage_start))
+
+                # --- Conversion des couleurs (8 bits, sRGB) ---
+                if color_converter:
+                    stage_start = time.perf_counter()
+                    img = color_converter.convert(img)
+                    result["convert_ms"] = self._elapsed_ms(stage_start)
+
+                # --- Choix du préréglage selon le contenu (statistiques sur une copie réduite) ---
+                # (variable locale : un préréglage d'un export précédent ne doit pas être repris)
+                item_renditions: List[Dict[str, Any]] = renditions
+                item_preset: Optional[str] = None
+                if content_aware:
+                    stage_start = time.perf_counter()
+                    item_preset = classify_image(img)
+                    item_renditions = preset_renditions[item_preset]
+                    result.update(preset=item_preset, analyze_ms=self._elapsed_ms(stage_start))
                 
-                # --- Redimensionnement ---
-                if resize_factor < 1.0 and resize_factor > 0:
-                    # Calcul des nouvelles dimensions
-                    new_width: int = int(img.width * resize_factor)
-                    new_height: int = int(img.height * resize_factor)
-                    
-                    if new_width > 0 and new_height > 0:
-                        # Redimensionnement avec l'algorithme de rééchantillonnage de haute qualité
-                        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # --- Conversion de mode ---
-                # Si le format est JPEG, les modes RGBA (transparence) ou P (palette) ne sont pas supportés
-                if save_format_key == "jpeg" and img.mode in ('RGBA', 'P'):
-                    # Convertit l'image au format RGB standard
-                    img = img.convert('RGB')
+                # --- Redimensionnements en cascade ---
+                stage_start = time.perf_counter()
+                sizes: List[Tuple[int, int]] = [self._target_size(source_size, r) for r in item_renditions]
+                resized: Dict[Tuple[int, int], Image.Image] = self._resize_cascade(img, sizes, resize_engine)
+                result.update(
+                    out_width=sizes[0][0], out_height=sizes[0][1], resize_ms=self._elapsed_ms(stage_start),
+                    format=", ".join(r["name"] for r in item_renditions), quality=item_renditions[0]["quality"]
+                )
+
+                # --- Encodage parallèle des déclinaisons (en mémoire) ---
+                # Pillow mémorise les paramètres de sauvegarde sur l'objet Image : deux déclinaisons
+                # de même taille ne doivent pas partager le même objet pendant l'encodage
+                stage_start = time.perf_counter()
+                sources: List[Image.Image] = []
+                for index, size in enumerate(sizes):
+                    sources.append(resized[size].copy() if size in sizes[:index] else resized[size])
+                while len(buffers) < len(item_renditions):
+                    buffers.append(io.BytesIO())
+                encoded = list(encoder_pool.map(self._encode_rendition, sources, item_renditions, buffers))
+                result["encode_ms"] = self._elapsed_ms(stage_start)
+
+                # --- Politique sans gain : chaque sortie est comparée à l'original avant toute écriture ---
+                max_size: float = item["old_size"] * (1 - min_gain_percent / 100)
+                decisions: List[str] = []
+                for data, size in zip(encoded, sizes):
+                    if no_gain_policy == "write" or (len(data) < item["old_size"] and len(data) <= max_size):
+                        decisions.append("write")
+                    elif no_gain_policy == "keep" and size != source_size:
+                        # L'original n'équivaut qu'à une déclinaison pleine résolution : une déclinaison
+                        # réduite est toujours écrite (ses consommateurs attendent ses dimensions et son format)
+                        decisions.append("write")
+                    else:
+                        decisions.append(no_gain_policy)
+                if all(decision == "skip" for decision in decisions):
+                    # Aucune sortie : l'original, plus petit, reste seul en place (et n'est jamais supprimé)
+                    journal.record(original_path, BatchJournal.SKIPPED, old_size=item["old_size"], new_size=0)
+                    total_old_size -= item["old_size"]
+                    skipped_count += 1
+                    success_count += 1
+                    result.update(status="skipped", out_bytes=0, gain_percent=0.0)
+                    logger.info(f"Aucun gain pour '{original_path}' : image ignorée")
+                    continue
+                stage_start = time.perf_counter()
 
-                # --- Définition des chemins d'exportation ---
+                # --- Écriture des déclinaisons ---
                 new_name: str = item["old_name"]
                 suffix: str = "_compressée" if add_suffixe else ""
-                # Nom du fichier final avec le nouveau format
-                export_filename: str = f"{new_name}{suffix}.{output_format.lower()}"
-                # Chemin temporaire/final du fichier
-                temp_path = pathlib.Path(self.export_path) / export_filename
+                outputs: List[str] = []
+                sizes_by_rendition: Dict[str, int] = {}
+                # Noms des déclinaisons remplacées par l'original, et fichiers déjà publiés pour cette image
+                kept: List[str] = []
+                published: set = set()
+                # Vrai si une sortie est l'original lui-même (il ne doit alors pas être supprimé)
+                in_place: bool = False
+                for rendition, data, decision in zip(item_renditions, encoded, decisions):
+                    if decision == "skip":
+                        continue
 
-                # --- Paramètres de sauvegarde de Pillow ---
-                pillow_params: Dict[str, Any] = {'quality': quality}
-                
-                # Ajout des options d'optimisation
-                if optimized_encoding:
-                    pillow_params['optimize'] = True
-                
-                # Suppression des métadonnées (EXIF)
-                if strip_metadata:
-                    pillow_params['exif'] = b'' 
-                
-                # Affichage progressif (spécifique à JPEG)
-                if progressive_loading and save_format_key == "jpeg":
-                    pillow_params['progressive'] = True
-                    
-                # --- SAUVEGARDE SUR LE DISQUE ---
-                img.save(temp_path, format=save_format_key, **pillow_params)
-                
-                # Lecture de la taille du nouveau fichier compressé
-                new_size: int = os.path.getsize(temp_path)
-                total_new_size += new_size
-                success_count += 1
+                    if decision == "keep":
+                        # L'original est publié tel quel, avec son extension d'origine
+                        export_filename: str = f"{new_name}{suffix}{rendition['filename_suffix']}{item['old_suffix']}"
+                        kept.append(rendition["name"])
+                        if export_filename in published:
+                            # Plusieurs déclinaisons sans gain de même libellé : un seul exemplaire de l'original
+                            sizes_by_rendition[rendition["name"]] = 0
+                            continue
+                    else:
+                        # Nom du fichier final avec le nouveau format
+                        export_filename = f"{new_name}{suffix}{rendition['filename_suffix']}.{rendition['extension']}"
+
+                    if use_zip and zip_file:
+                        if decision == "keep":
+                            # Ajoute l'original au ZIP (stocké sans recompression : il est déjà compressé)
+                            zip_file.write(original_path, export_filename, compress_type=ZIP_STORED)
+                        else:
+                            # Ajoute la déclinaison compressée au ZIP directement depuis le tampon (sans copie)
+                            zip_file.writestr(export_filename, data)
+                        outputs.append(export_filename)
+                    else:
+                        final_path: pathlib.Path = pathlib.Path(self.export_path) / export_filename
+                        # Fichier temporaire : le fichier final n'apparaît qu'une fois complet et synchronisé
+                        # (nom unique : plusieurs lots simultanés peuvent produire le même nom final)
+                        temp_path = final_path.with_name(f"{export_filename}.{uuid.uuid4().hex[:8]}.part")
+                        # Sortie à l'emplacement de l'original (dossier d'export = dossier source, même
+                        # extension, sans suffixe) : l'original ne doit alors jamais être supprimé
+                        on_original: bool = final_path.exists() and os.path.samefile(final_path, original_path)
+                        in_place = in_place or on_original
+                        if decision == "keep" and on_original:
+                            # L'original (ou un lien vers lui) est déjà à sa place : rien à écrire
+                            temp_path = None
+                        elif decision == "keep":
+                            self._link_or_copy(original_path, temp_path)
+                        else:
+                            with io.open(temp_path, mode="wb") as f:
+                                f.write(data)
+                                # Le fichier doit être durable avant d'être publié (et avant toute suppression d'original)
+                                f.flush()
+                                os.fsync(f.fileno())
+                        # Publication atomique du fichier final
+                        if temp_path:
+                            os.replace(temp_path, final_path)
+                            temp_path = None
+                        outputs.append(str(final_path))
 
-                # --- Gestion de l'exportation ZIP ---
+                    published.add(export_filename)
+                    sizes_by_rendition[rendition["name"]] = item["old_size"] if decision == "keep" else len(data)
+
+                new_size: int = sum(sizes_by_rendition.values())
+                # Une déclinaison ignorée n'a que l'original : il ne doit pas être supprimé
+                partial: bool = "skip" in decisions
+                keep_original: bool = partial or in_place
                 if use_zip and zip_file:
-                    # Ajoute le fichier compressé au ZIP
-                    zip_file.write(temp_path, export_filename)
-                    # Supprime le fichier temporaire du disque (car il est maintenant dans le zip)
-                    os.remove(temp_path) 
+                    journal.record(
+                        original_path, BatchJournal.ZIPPED,
+                        old_size=item["old_size"], new_size=new_size, outputs=outputs, renditions=sizes_by_rendition,
+                        preset=item_preset, kept=kept, keep_original=keep_original
+                    )
+                else:
+                    fsync_directory(self.export_path)
+                    journal.record(
+                        original_path, BatchJournal.WRITTEN,
+                        old_size=item["old_size"], new_size=new_size, outputs=outputs, renditions=sizes_by_rendition,
+                        preset=item_preset, kept=kept, keep_original=keep_original
+                    )
+
+                result.update(
+                    status="partial" if partial else "kept" if kept else "ok",
+                    out_bytes=new_size, write_ms=self._elapsed_ms(stage_start),
+                    gain_percent=round((1 - new_size / item["old_size"]) * 100, 1) if item["old_size"] else 0.0
+                )
+                total_new_size += new_size
+                success_count += 1
+                kept_count += len(kept)
+                for name, size in sizes_by_rendition.items():
+                    rendition_stats.setdefault(name, {"count": 0, "new_size": 0})
+                    rendition_stats[name]["count"] += 1
+                    rendition_stats[name]["new_size"] += size
+                if item_preset:
+                    preset_counts[item_preset] = preset_counts.get(item_preset, 0) + 1
                     
                 # --- Suppression de l'original ---
-                if delete_originals:
-                    item["image_obj"].close() # Fermeture explicite
-                    os.remove(original_path)
-                    logger.info(f"Original '{item["old_path"]}' supprimé")
+                if delete_originals and not keep_original:
+                    if use_zip:
+                        # Différée : le contenu du ZIP n'est durable qu'après sa fermeture
+                        pending_deletions.append(item)
+                    else:
+                        self._delete_original(item, journal)
             
             except Exception as e:
                 logger.error(f"Erreur de traitement/exportation pour {item['old_path']}: {e}")
+                result.update(status="error", error=str(e))
+                # Une vue peut être restée référencée (encodage interrompu) : les tampons sont remplacés
+                buffers.clear()
                 
                 # Tente de supprimer le fichier temporaire s'il a été créé avant l'erreur
                 if temp_path and os.path.exists(temp_path):
@@ -321,18 +1004,62 @@ class ApplicationModel:
                         os.remove(temp_path)
                     except Exception as cleanup_e:
                          logger.error(f"Erreur de nettoyage du fichier temporaire: {cleanup_e}")
-                continue
+            finally:
+                # Libère les vues pour pouvoir réutiliser les tampons à l'image suivante
+                for view in encoded:
+                    view.release()
+                if result["status"] != "resumed":
+                    result["total_ms"] = self._elapsed_ms(item_start)
+                results.append(result)
+                self._log_result(journal.batch_id, result)
+                # Notifie l'avancement (succès ou échec) à l'appelant éventuel
+                if progress_callback:
+                    progress_callback(done_count, total_items)
+
+        encoder_pool.shutdown()
+
+        # Ajoute aux statistiques par déclinaison et par préréglage les images terminées lors d'une exécution précédente
+        for entry in resumed_renditions:
+            for name, size in entry.get("renditions", {}).items():
+                rendition_stats.setdefault(name, {"count": 0, "new_size": 0})
+                rendition_stats[name]["count"] += 1
+                rendition_stats[name]["new_size"] += size
+            if entry.get("preset"):
+                preset_counts[entry["preset"]] = preset_counts.get(entry["preset"], 0) + 1
 
         # 4. Finalisation du ZIP
         if zip_file:
             zip_file.close()
-            # Si un ZIP a été créé, total_new_size doit refléter la taille du fichier ZIP lui-même
-            if zip_path and os.path.exists(zip_path):
-                 total_new_size = os.path.getsize(zip_path)
+            # Le ZIP doit être durable avant toute suppression d'original
+            fsync_path(str(zip_path))
+            fsync_directory(self.export_path)
+            journal.mark(BatchJournal.ZIP_CLOSED)
+
+        # Si un ZIP a été créé, total_new_size doit refléter la taille du fichier ZIP lui-même
+        if zip_path and os.path.exists(zip_path):
+             total_new_size = os.path.getsize(zip_path)
+
+        # Suppression différée des originaux exportés dans le ZIP
+        for item in pending_deletions:
+            try:
+                self._delete_original(item, journal)
+            except Exception as e:
+                logger.error(f"Erreur de suppression de l'original {item['old_path']}: {e}")
 
+        # Lot terminé : le journal n'a plus d'utilité (il reste ignoré par unfinished() si
+        # un arrêt brutal empêche sa suppression)
+        journal.mark(BatchJournal.COMPLETED)
+        journal.discard()
+        log_event(
+            logger, "batch", batch_id=journal.batch_id, files=len(results), success=success_count,
+            resumed=resumed_count, kept=kept_count, skipped=skipped_count,
+            in_bytes=total_old_size, out_bytes=total_new_size, zip=bool(zip_path)
+        )
 
         # 5. Calcul des statistiques finales
-        stats: Dict[str, Any] = {}
+        self.last_results = results
+        # Le détail par fichier est renvoyé même si aucune image n'a réussi (il contient les erreurs)
+        stats: Dict[str, Any] = {"results": results}
         if success_count > 0:
             # Conversion des octets en Mégaoctets (Mo)
             total_old_mo: float = round(total_old_size / 1000000, 2)
@@ -343,13 +1070,29 @@ class ApplicationModel:
             gain_percent: float = (gain_bytes / total_old_size) * 100 if total_old_size > 0 else 0
             
             # Remplissage du dictionnaire de statistiques
-            stats = {
+            stats.update({
                 "total_old_mo": total_old_mo,
                 "total_new_mo": total_new_mo,
                 "difference_mo": round(total_old_mo - total_new_mo, 2),
                 "gain_percent": round(gain_percent, 1),
-                "export_dir": self.export_path
-            }
+                # Tailles exactes en octets (fusion des statistiques de plusieurs lots, voir shard.py)
+                "total_old_bytes": total_old_size,
+                "total_new_bytes": total_new_size,
+                "export_dir": self.export_path,
+                "zip_path": str(zip_path) if zip_path else None,
+                "batch_id": journal.batch_id,
+                "resumed_count": resumed_count,
+                # Politique sans gain : déclinaisons remplacées par l'original, images ignorées
+                "kept_count": kept_count,
+                "skipped_count": skipped_count,
+                # Détail par déclinaison (taille cumulée des fichiers, hors compression ZIP)
+                "renditions": {
+                    name: {"count": r["count"], "total_new_mo": round(r["new_size"] / 1000000, 2), "new_bytes": r["new_size"]}
+                    for name, r in rendition_stats.items()
+                },
+                # Préréglages choisis selon le contenu : {nom: nombre d'images}
+                "presets": preset_counts
+            })
         
         # Retourne le nombre de succès et le dictionnaire de statistiques
         return success_count, stats
@@ -0,0 +1,106 @@
+import logging
+from typing import Dict, Any
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+# Préréglages d'encodage par type de contenu (remplacent format, qualité et effort des options)
+PRESETS: Dict[str, Dict[str, Any]] = {
+    # Graphismes à aplats (logos, pictogrammes, schémas) : palette PNG exacte, sans perte
+    "graphic": {"output_format": "PNG", "quality": 100, "effort": 80},
+    # Captures d'écran (texte, interfaces) : PNG quantifié, les aplats se compressent très bien
+    "screenshot": {"output_format": "PNG", "quality": 90, "effort": 80},
+    # Photographies avec transparence : WebP avec perte (conserve le canal alpha)
+    "photo_alpha": {"output_format": "WEBP", "quality": 80, "effort": 80},
+    # Photographies : WebP avec perte
+    "photo": {"output_format": "WEBP", "quality": 75, "effort": 80},
+}
+
+# Plus grand côté de la copie réduite analysée (quelques dizaines de milliers de pixels suffisent)
+SAMPLE_SIZE: int = 256
+# Nombre maximal de couleurs d'un graphisme (au-delà, une palette exacte n'est plus possible)
+MAX_GRAPHIC_COLORS: int = 256
+# Écart de luminance entre pixels voisins à partir duquel on compte un contour
+EDGE_THRESHOLD: int = 32
+
+
+def analyze_image(img: Image.Image) -> Dict[str, float]:
+    """
+    Calcule des statistiques peu coûteuses sur une copie réduite de l'image.
+
+    La réduction se fait au plus proche voisin : elle ne crée pas de nouvelles couleurs,
+    ce qui préserve le comptage des couleurs des graphismes.
+
+    Args:
+        img: L'image source (déjà décodée).
+
+    Returns:
+        Un dictionnaire avec :
+            - colors : nombre de couleurs distinctes de l'échantillon ;
+            - edge_density : part des pixels situés sur un contour marqué ;
+            - flat_ratio : part des pixels identiques à leur voisin de droite (aplats) ;
+            - alpha_ratio : part des pixels non opaques (0 sans canal alpha).
+    """
+    # Import différé : NumPy coûte à lui seul plus que le reste du démarrage de l'application,
+    # et il n'est utile qu'en mode "Stockage optimisé" (chargé une seule fois, au premier appel)
+    import numpy as np
+
+    scale: float = min(1.0, SAMPLE_SIZE / max(img.size))
+    sample_size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    has_alpha: bool = 'A' in img.getbands() or (img.mode == 'P' and 'transparency' in img.info)
+    sample: Image.Image = img.resize(sample_size, Image.Resampling.NEAREST).convert('RGBA' if has_alpha else 'RGB')
+
+    pixels: np.ndarray = np.asarray(sample, dtype=np.uint8)
+    # Empaquette chaque pixel en un entier pour compter les couleurs distinctes en une passe
+    packed: np.ndarray = np.zeros(pixels.shape[:2], dtype=np.uint32)
+    for channel in range(pixels.shape[2]):
+        packed = (packed << 8) | pixels[:, :, channel]
+    colors: int = int(np.unique(packed).size)
+
+    # Luminance approchée (entiers) puis écarts avec les voisins de droite et du dessous
+    luma: np.ndarray = (
+        pixels[:, :, 0].astype(np.int32) * 77 + pixels[:, :, 1].astype(np.int32) * 150
+        + pixels[:, :, 2].astype(np.int32) * 29
+    ) >> 8
+    dx: np.ndarray = np.abs(np.diff(luma, axis=1))
+    dy: np.ndarray = np.abs(np.diff(luma, axis=0))
+    edges: int = int((dx > EDGE_THRESHOLD).sum() + (dy > EDGE_THRESHOLD).sum())
+    edge_density: float = edges / max(1, dx.size + dy.size)
+    flat_ratio: float = float((packed[:, 1:] == packed[:, :-1]).mean()) if packed.shape[1] > 1 else 1.0
+
+    alpha_ratio: float = float((pixels[:, :, 3] < 255).mean()) if has_alpha else 0.0
+
+    return {
+        "colors": colors,
+        "edge_density": round(edge_density, 4),
+        "flat_ratio": round(flat_ratio, 4),
+        "alpha_ratio": round(alpha_ratio, 4),
+    }
+
+
+def classify_image(img: Image.Image) -> str:
+    """
+    Choisit le préréglage (clé de PRESETS) adapté au contenu de l'image.
+
+    Args:
+        img: L'image source (déjà décodée).
+
+    Returns:
+        Le nom du préréglage : "graphic", "screenshot", "photo_alpha" ou "photo".
+    """
+    stats: Dict[str, float] = analyze_image(img)
+
+    if stats["colors"] <= MAX_GRAPHIC_COLORS:
+        preset: str = "graphic"
+    elif stats["flat_ratio"] >= 0.5 and stats["edge_density"] >= 0.01:
+        # Beaucoup d'aplats et des contours nets (texte, bordures) : capture d'écran
+        preset = "screenshot"
+    elif stats["alpha_ratio"] > 0:
+        preset = "photo_alpha"
+    else:
+        preset = "photo"
+
+    logger.debug(f"Préréglage '{preset}' choisi ({stats})")
+    return preset
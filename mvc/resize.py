@@ -0,0 +1,86 @@
+from typing import Dict, Any, List, Optional, Tuple
+
+import PIL
+from PIL import Image
+
+
+# Pillow-SIMD (remplaçant de Pillow compilé avec SSE4/AVX2) se reconnaît à son numéro de version
+# ("9.5.0.post1") : ses filtres de rééchantillonnage vectorisés rendent LANCZOS peu coûteux
+SIMD_AVAILABLE: bool = ".post" in PIL.__version__
+
+
+class ResizeEngine:
+    """
+    Choisit le filtre et la stratégie de redimensionnement selon le facteur d'échelle et
+    le compromis vitesse/qualité demandé (option 'resize_quality') :
+
+        - "best" : LANCZOS directement depuis l'image pleine résolution (comportement historique) ;
+        - "balanced" : les JPEG sont décodés directement à la plus petite échelle DCT couvrant
+          la cible (draft : 1/2, 1/4, 1/8) ; au-delà, réduction préalable par moyenne de blocs
+          (Image.reduce(), quasi gratuite) jusqu'à un facteur 2 de la cible, puis passe LANCZOS
+          finale. Sous Pillow-SIMD, LANCZOS est assez rapide pour se passer de la réduction préalable ;
+        - "fast" : même décodage réduit, réduction par blocs jusqu'à la cible puis passe BILINEAR.
+    """
+
+    QUALITIES: Tuple[str, ...] = ("fast", "balanced", "best")
+
+    # Paramètres de chaque niveau : filtre final, écart de réduction préalable (None = aucune)
+    # et marge du décodage réduit des JPEG (None = décodage pleine résolution)
+    STRATEGIES: Dict[str, Dict[str, Any]] = {
+        "fast": {"resample": Image.Resampling.BILINEAR, "reducing_gap": 1.0, "draft_margin": 1.0},
+        "balanced": {"resample": Image.Resampling.LANCZOS, "reducing_gap": 2.0, "draft_margin": 1.0},
+        "best": {"resample": Image.Resampling.LANCZOS, "reducing_gap": None, "draft_margin": None},
+    }
+
+    def __init__(self, quality: str = "balanced") -> None:
+        """
+        Args:
+            quality: Compromis vitesse/qualité ("fast", "balanced" ou "best").
+
+        Raises:
+            ValueError: Si le niveau de qualité est inconnu.
+        """
+        if quality not in self.STRATEGIES:
+            raise ValueError(f"Qualité de redimensionnement inconnue: {quality}")
+        self.quality: str = quality
+        strategy: Dict[str, Any] = dict(self.STRATEGIES[quality])
+        if SIMD_AVAILABLE and quality == "balanced":
+            # Les filtres vectorisés rendent la réduction préalable inutile
+            strategy["reducing_gap"] = None
+        self.resample: Image.Resampling = strategy["resample"]
+        self.reducing_gap: Optional[float] = strategy["reducing_gap"]
+        self.draft_margin: Optional[float] = strategy["draft_margin"]
+
+    def draft(self, img: Image.Image, sizes: List[Tuple[int, int]]) -> None:
+        """
+        Demande au décodeur, avant le chargement des pixels, une image réduite suffisante pour
+        la plus grande des tailles cibles (mise à l'échelle DCT des JPEG : 1/2, 1/4 ou 1/8).
+        Sans effet pour les autres formats, ou si l'image est déjà décodée.
+
+        Args:
+            img: L'image ouverte, pas encore chargée (img.load() non appelé).
+            sizes: Les dimensions cibles de toutes les déclinaisons.
+        """
+        if self.draft_margin is None or img.format != "JPEG" or not sizes:
+            return
+        width: int = max(size[0] for size in sizes)
+        height: int = max(size[1] for size in sizes)
+        requested: Tuple[int, int] = (round(width * self.draft_margin), round(height * self.draft_margin))
+        if requested[0] < img.width and requested[1] < img.height:
+            img.draft(img.mode, requested)
+
+    def resize(self, img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """
+        Redimensionne une image avec la stratégie du niveau de qualité.
+
+        Args:
+            img: L'image source décodée.
+            size: Les dimensions cibles (largeur, hauteur).
+
+        Returns:
+            L'image redimensionnée (l'image source si elle a déjà ces dimensions).
+        """
+        if size == img.size:
+            return img
+        # reducing_gap n'agit que si le facteur de réduction dépasse l'écart choisi
+        return img.resize(size, self.resample, reducing_gap=self.reducing_gap)
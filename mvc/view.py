@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import filedialog 
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, List, Optional, Callable
 
 import ttkbootstrap as ttk
 from ttkbootstrap import Meter, Label, Checkbutton, Button, Entry
@@ -15,15 +15,19 @@ class ApplicationView:
     avec le système de fichiers (dialogues).
     """
     
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk, output_formats: Optional[List[str]] = None) -> None:
         """
         Initialise la Vue, configure la fenêtre principale et les variables de contrôle.
 
         Args:
             master: La fenêtre principale (root) de l'application.
+            output_formats: Les formats de sortie proposés (encodeurs détectés par le Modèle) ; la liste
+                peut être remplacée après l'affichage de la fenêtre avec set_output_formats().
         """
         # Stocke la référence à la fenêtre principale
         self.master: tk.Tk = master
+        # Formats de sortie proposés dans les Radiobuttons
+        self.output_formats: List[str] = output_formats or ["JPG", "JPEG", "WEBP"]
         
         # Configure les propriétés de base de la fenêtre
         master.title("Compresseur JPG/JPEG")
@@ -37,6 +41,8 @@ class ApplicationView:
         self.optimized_encoding_var: tk.BooleanVar = tk.BooleanVar(value=False)
         self.strip_metadata_var: tk.BooleanVar = tk.BooleanVar(value=False)
         self.progressive_loading_var: tk.BooleanVar = tk.BooleanVar(value=False)
+        # Effort d'encodage (0 = rapide, 50 = défaut du codec, 100 = fichiers les plus petits)
+        self.effort_var: tk.IntVar = tk.IntVar(value=50)
         
         # Variables pour les options d'exportation
         self.zip_export_var: tk.BooleanVar = tk.BooleanVar(value=False)
@@ -56,6 +62,9 @@ class ApplicationView:
         self.import_button: Button | None = None
         self.export_final_button: Button | None = None
         self.reset_button: Button | None = None
+        self.report_button: Button | None = None
+        self.results_window: ResultsWindow | None = None
+        self.format_block_frame: Label | None = None
         self.delete_checkbutton: Checkbutton | None = None
         self.widget_references: Dict[str, Any] = {} # Pour stocker les widgets nécessaires au Contrôleur
         
@@ -128,19 +137,9 @@ class ApplicationView:
         self.resize_meter.pack()
 
         # BLOC 2 : FORMAT (RADIOBUTTONS)
-        format_block_frame: Label = ttk.Labelframe(horizontal_master_frame, text="Format de sortie", padding=20, bootstyle="info") 
-        format_block_frame.pack(side="left", padx=15, fill="y", ipadx=30)
-
-        # Création des Radiobuttons pour le choix du format (JPG, JPEG, WEBP)
-        formats: list[str] = ["JPG", "JPEG", "WEBP"]
-        for fmt in formats:
-            ttk.Radiobutton(
-                format_block_frame, 
-                text=fmt, 
-                value=fmt, 
-                bootstyle="info",
-                variable=self.output_format_var # Lié à la variable de format
-            ).pack(pady=5, padx=5, anchor="w")
+        self.format_block_frame = ttk.Labelframe(horizontal_master_frame, text="Format de sortie", padding=20, bootstyle="info") 
+        self.format_block_frame.pack(side="left", padx=15, fill="y", ipadx=30)
+        self.set_output_formats(self.output_formats)
 
         # BLOC 3 : OPTIMISATION (CHECKBUTTONS)
         fine_opt_block_frame: Label = ttk.Labelframe(horizontal_master_frame, text="Optimisation", padding=20, bootstyle="info")
@@ -170,6 +169,18 @@ class ApplicationView:
             variable=self.progressive_loading_var
         ).pack(pady=5, anchor="w")
 
+        # Curseur de l'effort d'encodage (temps de calcul contre taille des fichiers)
+        effort_container: ttk.Frame = ttk.Frame(fine_opt_block_frame)
+        effort_container.pack(pady=(5, 0), anchor="w", fill="x")
+        ttk.Label(effort_container, text="Effort d'encodage").pack(side="left", padx=(0, 10))
+        ttk.Scale(
+            effort_container,
+            from_=0,
+            to=100,
+            bootstyle="info",
+            variable=self.effort_var
+        ).pack(side="left", fill="x", expand=True)
+
 
         # --------------------------------------------------------------------------------------
         # --- CADRE 2 : CONFIGURATION DE L'EXPORTATION (Destination + Options) ---
@@ -276,7 +287,18 @@ class ApplicationView:
             state="disabled", # Désactivé par défaut
             # La commande sera définie par le contrôleur
         )
-        self.reset_button.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        self.reset_button.pack(side="left", fill="x", expand=True, padx=10)
+
+        # 4. Bouton: Rapport détaillé du dernier export
+        self.report_button = ttk.Button(
+            action_buttons_frame, 
+            text="Voir le rapport", 
+            bootstyle="secondary-outline",
+            width=25,
+            state="disabled", # Désactivé par défaut
+            # La commande sera définie par le contrôleur
+        )
+        self.report_button.pack(side="left", fill="x", expand=True, padx=(10, 0))
 
 
         # --------------------------------------------------------------------------------------
@@ -297,12 +319,34 @@ class ApplicationView:
             'import_button': self.import_button,
             'export_final_button': self.export_final_button,
             'reset_button': self.reset_button,
+            'report_button': self.report_button,
             'optimized_storage_checkbutton': optimized_storage_checkbutton, # Le Checkbutton de bascule en haut
             'export_path_button': export_path_button, # Le bouton pour choisir le chemin (les points de suspension)
         }
 
     # --- Méthodes publiques de mise à jour de la Vue (appelées par le Contrôleur) ---
         
+    def set_output_formats(self, output_formats: List[str]) -> None:
+        """
+        (Re)crée les Radiobuttons du choix du format de sortie.
+
+        Args:
+            output_formats: Les formats proposés (encodeurs disponibles).
+        """
+        self.output_formats = output_formats
+        for child in self.format_block_frame.winfo_children():
+            child.destroy()
+
+        # Création des Radiobuttons pour le choix du format (encodeurs disponibles, trois par colonne)
+        for index, fmt in enumerate(output_formats):
+            ttk.Radiobutton(
+                self.format_block_frame, 
+                text=fmt, 
+                value=fmt, 
+                bootstyle="info",
+                variable=self.output_format_var # Lié à la variable de format
+            ).grid(row=index % 3, column=index // 3, pady=5, padx=5, sticky="w")
+
     def update_status_label(self, message: str, bootstyle: str = "info") -> None:
         """
         Met à jour le texte et le style (couleur) du Label de statut en bas de l'application.
@@ -314,14 +358,17 @@ class ApplicationView:
         # Configure le texte et le style visuel
         self.status_label.configure(text=message, bootstyle=bootstyle)
 
-    def update_state_buttons(self, import_enabled: bool, export_enabled: bool, reset_enabled: bool) -> None:
+    def update_state_buttons(
+        self, import_enabled: bool, export_enabled: bool, reset_enabled: bool, report_enabled: bool = False
+    ) -> None:
         """
-        Met à jour l'état (actif/désactivé) des trois boutons d'action principaux.
+        Met à jour l'état (actif/désactivé) des boutons d'action principaux.
 
         Args:
             import_enabled: True pour activer le bouton d'importation, False pour le désactiver.
             export_enabled: True pour activer le bouton d'exportation, False pour le désactiver.
             reset_enabled: True pour activer le bouton de réinitialisation, False pour le désactiver.
+            report_enabled: True pour activer le bouton du rapport (après un export), False pour le désactiver.
         """
         # Configure l'état du bouton d'importation
         self.import_button.configure(state="normal" if import_enabled else "disabled")
@@ -329,6 +376,8 @@ class ApplicationView:
         self.export_final_button.configure(state="normal" if export_enabled else "disabled")
         # Configure l'état du bouton de réinitialisation
         self.reset_button.configure(state="normal" if reset_enabled else "disabled")
+        # Configure l'état du bouton du rapport
+        self.report_button.configure(state="normal" if report_enabled else "disabled")
         
     def set_meter_values(self, quality: int, resize: int) -> None:
         """
@@ -366,5 +415,209 @@ class ApplicationView:
         return filedialog.askopenfilenames(
             title="Sélectionner les images à compresser",
             # Filtre les types de fichiers acceptés
-            filetypes=[("Image Files", "*.jpg *.jpeg")]
-        )
\ No newline at end of file
+            filetypes=[
+                ("Image Files", "*.jpg *.jpeg *.png *.webp *.bmp *.tif *.tiff"),
+                ("JPG/JPEG", "*.jpg *.jpeg"),
+            ]
+        )
+
+    def show_results(self, results: List[Dict[str, Any]], on_export: Callable[[str], None]) -> None:
+        """
+        Affiche (ou met à jour) la fenêtre du rapport détaillé par fichier.
+
+        Args:
+            results: Les résultats par fichier renvoyés par le Modèle.
+            on_export: Fonction appelée avec le format ("csv" ou "json") lors d'un clic sur un bouton d'export.
+        """
+        if self.results_window is None or not self.results_window.winfo_exists():
+            self.results_window = ResultsWindow(self.master, on_export)
+        self.results_window.set_results(results)
+        self.results_window.lift()
+
+    def open_save_report_dialog(self, extension: str) -> str:
+        """
+        Ouvre la boîte de dialogue native pour choisir le fichier de rapport à enregistrer.
+
+        Args:
+            extension: L'extension du rapport ("csv" ou "json").
+
+        Returns:
+            Le chemin choisi ou une chaîne vide si annulé.
+        """
+        return filedialog.asksaveasfilename(
+            title="Exporter le rapport",
+            defaultextension=f".{extension}",
+            filetypes=[(extension.upper(), f"*.{extension}")]
+        )
+
+
+class ResultsWindow(ttk.Toplevel):
+    """
+    Fenêtre du rapport par fichier : tableau triable (clic sur un en-tête) et boutons d'export.
+
+    Le tableau est virtualisé : le Treeview ne contient jamais plus de VISIBLE_ROWS lignes,
+    dont les valeurs sont réécrites selon la position de la barre de défilement. Des dizaines
+    de milliers de résultats restent ainsi fluides à afficher, trier et parcourir.
+    """
+
+    # Nombre de lignes réellement présentes dans le Treeview
+    VISIBLE_ROWS: int = 25
+
+    # Colonnes affichées : (clé du résultat, titre, largeur)
+    COLUMNS: List[Tuple[str, str, int]] = [
+        ("file", "Fichier", 260),
+        ("status", "Statut", 70),
+        ("in_bytes", "Entrée (Ko)", 85),
+        ("out_bytes", "Sortie (Ko)", 85),
+        ("gain_percent", "Gain (%)", 70),
+        ("dimensions", "Dimensions", 95),
+        ("format", "Format", 90),
+        ("quality", "Qualité", 60),
+        ("preset", "Profil", 80),
+        ("total_ms", "Temps (ms)", 80),
+        ("error", "Erreur", 200),
+    ]
+
+    def __init__(self, master: tk.Tk, on_export: Callable[[str], None]) -> None:
+        """
+        Construit la fenêtre du rapport.
+
+        Args:
+            master: La fenêtre principale de l'application.
+            on_export: Fonction appelée avec le format ("csv" ou "json") à exporter.
+        """
+        super().__init__(master=master, title="Rapport de compression")
+        self.geometry("1200x620")
+
+        # Résultats complets (triés) et position de la première ligne affichée
+        self.results: List[Dict[str, Any]] = []
+        self.offset: int = 0
+        # Colonne et sens du tri courant
+        self.sort_key: Optional[str] = None
+        self.sort_reverse: bool = False
+
+        # --- Barre d'outils : résumé et boutons d'export ---
+        toolbar: ttk.Frame = ttk.Frame(self, padding=10)
+        toolbar.pack(fill="x")
+        self.summary_label: Label = ttk.Label(toolbar, text="")
+        self.summary_label.pack(side="left")
+        ttk.Button(
+            toolbar, text="Exporter en JSON", bootstyle="info-outline", command=lambda: on_export("json")
+        ).pack(side="right")
+        ttk.Button(
+            toolbar, text="Exporter en CSV", bootstyle="info-outline", command=lambda: on_export("csv")
+        ).pack(side="right", padx=10)
+
+        # --- Tableau virtualisé ---
+        table_frame: ttk.Frame = ttk.Frame(self, padding=(10, 0, 10, 10))
+        table_frame.pack(fill="both", expand=True)
+
+        self.tree: ttk.Treeview = ttk.Treeview(
+            table_frame,
+            columns=[key for key, _, _ in self.COLUMNS],
+            show="headings",
+            height=self.VISIBLE_ROWS,
+            bootstyle="info",
+        )
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title, command=lambda k=key: self.sort_by(k))
+            self.tree.column(key, width=width, anchor="w" if key in ("file", "error", "format") else "e")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        # La barre de défilement pilote la position dans les résultats, et non le contenu du Treeview
+        self.scrollbar: ttk.Scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self._on_scroll)
+        self.scrollbar.pack(side="left", fill="y")
+
+        # Lignes fixes du Treeview, dont seules les valeurs changent
+        self.row_ids: List[str] = [self.tree.insert("", "end", values=()) for _ in range(self.VISIBLE_ROWS)]
+
+        # Molette (Windows/macOS : <MouseWheel>, X11 : boutons 4 et 5)
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1, 3))
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-1, 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(1, 3))
+
+    def set_results(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Remplace les résultats affichés (le tri courant est conservé).
+
+        Args:
+            results: Les résultats par fichier renvoyés par le Modèle.
+        """
+        self.results = list(results)
+        if self.sort_key:
+            self._sort()
+        self.offset = 0
+
+        errors: int = sum(1 for r in self.results if r["status"] == "error")
+        self.summary_label.configure(text=f"{len(self.results)} fichier(s) — {errors} erreur(s)")
+        self._render()
+
+    def sort_by(self, key: str) -> None:
+        """
+        Trie les résultats selon une colonne (un second clic inverse l'ordre).
+
+        Args:
+            key: La clé de la colonne cliquée.
+        """
+        self.sort_reverse = not self.sort_reverse if self.sort_key == key else False
+        self.sort_key = key
+        self._sort()
+        self.offset = 0
+        self._render()
+
+    def _sort(self) -> None:
+        """Trie les résultats selon la colonne courante (les valeurs vides en dernier)."""
+        key: str = self.sort_key
+        if key == "dimensions":
+            sort_value: Callable[[Dict[str, Any]], Any] = lambda r: (r["width"] or 0) * (r["height"] or 0)
+        else:
+            sort_value = lambda r: r[key]
+        filled: List[Dict[str, Any]] = [r for r in self.results if sort_value(r) not in ("", None)]
+        empty: List[Dict[str, Any]] = [r for r in self.results if sort_value(r) in ("", None)]
+        filled.sort(key=sort_value, reverse=self.sort_reverse)
+        self.results = filled + empty
+
+    def _format_row(self, result: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Met en forme un résultat pour l'affichage (Ko, dimensions)."""
+        values: List[Any] = []
+        for key, _, _ in self.COLUMNS:
+            if key in ("in_bytes", "out_bytes"):
+                values.append(f"{result[key] / 1000:.1f}" if result[key] != "" else "")
+            elif key == "dimensions":
+                values.append(f"{result['width']}×{result['height']}" if result["width"] else "")
+            else:
+                values.append(result[key])
+        return tuple(values)
+
+    def _render(self) -> None:
+        """Réécrit les lignes visibles à partir de self.offset et met à jour la barre de défilement."""
+        for index, row_id in enumerate(self.row_ids):
+            position: int = self.offset + index
+            if position < len(self.results):
+                self.tree.item(row_id, values=self._format_row(self.results[position]))
+            else:
+                self.tree.item(row_id, values=())
+
+        total: int = max(1, len(self.results))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.VISIBLE_ROWS) / total))
+
+    def _scroll_to(self, offset: int) -> None:
+        """Déplace la première ligne affichée (bornée) puis redessine."""
+        max_offset: int = max(0, len(self.results) - self.VISIBLE_ROWS)
+        offset = max(0, min(max_offset, offset))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _scroll_by(self, direction: int, rows: int) -> str:
+        """Fait défiler de quelques lignes ; "break" empêche le défilement natif du Treeview."""
+        self._scroll_to(self.offset + direction * rows)
+        return "break"
+
+    def _on_scroll(self, action: str, amount: str, unit: str = "units") -> None:
+        """Commande de la barre de défilement ("moveto" fraction, ou "scroll" n units/pages)."""
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.results)))
+        elif action == "scroll":
+            step: int = self.VISIBLE_ROWS if unit == "pages" else 1
+            self._scroll_to(self.offset + int(amount) * step)
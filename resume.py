@@ -0,0 +1,72 @@
+import sys
+import argparse
+from typing import List
+
+from mvc.model import ApplicationModel
+from mvc.journal import BatchJournal
+from mvc.logging_config import setup_logging
+
+
+def describe(batch_id: str) -> str:
+    """
+    Résume l'état d'un lot interrompu à partir de son journal.
+
+    Args:
+        batch_id: Identifiant du lot.
+
+    Returns:
+        Une ligne : identifiant, images terminées sur le total, dossier d'exportation.
+    """
+    journal: BatchJournal = BatchJournal.open(batch_id)
+    done: int = sum(
+        1 for entry in journal.entries.values()
+        if entry.get("state") in (BatchJournal.WRITTEN, BatchJournal.SKIPPED, BatchJournal.ORIGINAL_DELETED)
+        or (entry.get("state") == BatchJournal.ZIPPED and BatchJournal.ZIP_CLOSED in journal.events)
+    )
+    return f"{batch_id}  {done}/{len(journal.header['files'])} image(s)  -> {journal.header['export_path']}"
+
+
+def resume(batch_ids: List[str]) -> bool:
+    """
+    Reprend des lots interrompus, l'un après l'autre.
+
+    Args:
+        batch_ids: Identifiants des lots (voir BatchJournal.unfinished()).
+
+    Returns:
+        True si tous les lots ont été repris avec succès.
+    """
+    model: ApplicationModel = ApplicationModel()
+    all_done: bool = True
+    for batch_id in batch_ids:
+        success_count, stats = model.resume_batch(
+            batch_id, progress_callback=lambda done, total: print(f"  {done}/{total}", end="\r")
+        )
+        if success_count:
+            print(
+                f"Lot {batch_id} terminé : {success_count} image(s) (dont {stats['resumed_count']} déjà faites), "
+                f"{stats['total_old_mo']:.2f} Mo -> {stats['total_new_mo']:.2f} Mo"
+            )
+        else:
+            all_done = False
+            print(f"Échec de la reprise du lot {batch_id} : {stats.get('error_msg', 'aucune image traitée')}")
+        model.reset_data()
+    return all_done
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Liste ou reprend les lots d'exportation interrompus (logs/journals/).")
+    parser.add_argument("batch_ids", nargs="*", help="Lots à reprendre (sans argument : liste des lots interrompus)")
+    parser.add_argument("--all", action="store_true", help="Reprend tous les lots interrompus")
+    args = parser.parse_args()
+
+    setup_logging()
+    unfinished: List[str] = BatchJournal.unfinished()
+    if not args.batch_ids and not args.all:
+        if not unfinished:
+            print("Aucun lot interrompu.")
+        for batch_id in unfinished:
+            print(describe(batch_id))
+        sys.exit(0)
+
+    sys.exit(0 if resume(unfinished if args.all else args.batch_ids) else 1)
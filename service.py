@@ -0,0 +1,465 @@
+import os
+import hmac
+import json
+import uuid
+import time
+import secrets
+import logging
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueListener
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+from mvc.model import ApplicationModel
+from mvc.logging_config import setup_logging, setup_worker_logging, listen
+from utils import get_writable_path
+
+logger = logging.getLogger(__name__)
+
+
+# Jeton d'accès à l'API, lisible seulement par l'utilisateur (permissions 0600) : une page web
+# ouverte dans le navigateur peut joindre 127.0.0.1, mais ne peut pas lire ce fichier
+TOKEN_FILE: str = "settings/service_token"
+
+# Noms d'hôte acceptés dans l'en-tête Host (protection contre le DNS rebinding)
+LOCAL_HOSTS: Tuple[str, ...] = ("127.0.0.1", "localhost", "[::1]")
+
+# Conservation des jobs terminés (avec leur rapport par fichier) dans le registre du service
+JOB_TTL: float = 3600.0
+MAX_FINISHED_JOBS: int = 1000
+
+
+def read_token() -> str:
+    """
+    Lit le jeton d'accès à l'API, en le créant au premier démarrage.
+    Un fichier lisible par d'autres utilisateurs est remplacé par un nouveau jeton.
+
+    Returns:
+        Le jeton, à envoyer par les clients dans l'en-tête "Authorization: Bearer <jeton>".
+    """
+    path: str = get_writable_path(TOKEN_FILE)
+    try:
+        if os.stat(path).st_mode & 0o077 == 0:
+            with open(path, mode="r", encoding="utf-8") as f:
+                token: str = f.read().strip()
+            if token:
+                return token
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+    token = secrets.token_urlsafe(32)
+    # Création exclusive avec les permissions définitives (pas de fenêtre où le fichier serait lisible)
+    fd: int = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, mode="w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+# --- Côté processus de travail (worker) ---
+# Chaque processus du pool garde un ApplicationModel "chaud" : l'interpréteur, Pillow
+# et ses plugins ne sont importés qu'une seule fois, au démarrage du service.
+
+_worker_model: Optional[ApplicationModel] = None
+_progress_queue: Optional[Any] = None
+
+
+def _init_worker(progress_queue: Any, log_queue: Any) -> None:
+    """
+    Initialise un processus du pool : crée le Modèle et précharge les plugins Pillow.
+
+    Args:
+        progress_queue: File multiprocessing partagée pour remonter l'avancement des jobs.
+        log_queue: File multiprocessing des journaux, écrits par le processus principal.
+    """
+    global _worker_model, _progress_queue
+    from PIL import Image
+
+    # Les journaux du processus sont envoyés au service (un seul écrivain par fichier)
+    setup_worker_logging(log_queue)
+
+    # Charge tous les plugins de formats dès maintenant plutôt qu'au premier job
+    Image.init()
+    _worker_model = ApplicationModel()
+    _progress_queue = progress_queue
+
+
+def _warm_up() -> int:
+    """Tâche vide soumise au démarrage pour forcer la création des processus du pool."""
+    return multiprocessing.current_process().pid
+
+
+def _run_job(job_id: str, files: List[str], export_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Exécute un job de compression complet dans un processus du pool.
+
+    Args:
+        job_id: Identifiant du job (utilisé pour la remontée de l'avancement).
+        files: Chemins absolus des images à compresser.
+        export_path: Dossier d'exportation ('' pour le dossier persistant du Modèle).
+        options: Options de compression (schéma ApplicationModel.DEFAULT_OPTIONS).
+
+    Returns:
+        Un dictionnaire sérialisable en JSON : images chargées, succès et statistiques.
+    """
+    model: ApplicationModel = _worker_model
+
+    def report(done: int, total: int) -> None:
+        _progress_queue.put((job_id, done, total))
+
+    try:
+        loaded: int = model.load_images(files)
+        # Signale le démarrage effectif du job (0 image traitée sur le total chargé)
+        report(0, loaded)
+        if export_path:
+            model.export_path = export_path
+        success_count, stats = model.process_and_export(options, progress_callback=report)
+    finally:
+        # Ferme les objets PIL et restaure le chemin d'exportation persistant pour le job suivant
+        model.reset_data()
+
+    return {"loaded": loaded, "success_count": success_count, "stats": stats}
+
+
+# --- Côté processus principal (service) ---
+
+class CompressionService:
+    """
+    Service local de compression : maintient un pool de processus chaud et une file de jobs
+    consultable (statut, avancement, résultat).
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        """
+        Démarre le pool de processus et le thread de collecte de l'avancement.
+
+        Args:
+            workers: Nombre de processus du pool (par défaut, le nombre de CPU).
+        """
+        self.workers: int = workers or multiprocessing.cpu_count()
+        # Contexte "spawn" : évite de dupliquer par fork les threads du serveur HTTP
+        self._context = multiprocessing.get_context("spawn")
+        self._progress_queue: Any = self._context.Queue()
+        # Journaux des processus du pool, écrits dans les fichiers du service par un écouteur dédié
+        setup_logging()
+        self._log_queue: Any = self._context.Queue()
+        self._log_listener: QueueListener = listen(self._log_queue)
+        self._executor: ProcessPoolExecutor = self._create_executor()
+
+        # Registre des jobs : {job_id: {"status": str, "progress": {...}, "result": ..., ...}}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+        self._progress_thread: threading.Thread = threading.Thread(target=self._collect_progress, daemon=True)
+        self._progress_thread.start()
+
+    def warm_up(self) -> None:
+        """Crée immédiatement tous les processus du pool pour que le premier job ne paie pas leur démarrage."""
+        futures: List[Future] = [self._executor.submit(_warm_up) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+        logger.info(f"Service de compression prêt ({self.workers} processus)")
+
+    def submit(self, files: List[str], options: Dict[str, Any], export_path: str = "") -> Tuple[str, Optional[str]]:
+        """
+        Ajoute un job à la file du pool.
+
+        Un processus du pool mort brutalement (mémoire épuisée, signal) rend le pool définitivement
+        inutilisable : il est alors recréé, et le job, refusé, est enregistré comme échoué.
+
+        Args:
+            files: Chemins absolus des images à compresser.
+            options: Options de compression déjà validées.
+            export_path: Dossier d'exportation ('' pour le dossier persistant).
+
+        Returns:
+            (identifiant du job créé, message d'erreur ou None si le job a été mis en file).
+        """
+        job_id: str = uuid.uuid4().hex
+        job: Dict[str, Any] = {
+            "job_id": job_id,
+            "status": "queued",
+            "progress": {"done": 0, "total": len(files)},
+            "result": None,
+            "error_msg": None,
+            "submitted_at": time.time(),
+            "finished_at": None,
+        }
+        broken_executor: Optional[ProcessPoolExecutor] = None
+        with self._lock:
+            self._evict_finished()
+            try:
+                future: Future = self._executor.submit(_run_job, job_id, files, export_path, options)
+            except BrokenProcessPool:
+                broken_executor = self._executor
+                self._executor = self._create_executor()
+                job.update(status="failed", finished_at=time.time(),
+                           error_msg="Pool de processus interrompu : pool recréé, soumettre à nouveau le job.")
+            # Le job n'est enregistré qu'une fois son sort connu (en file ou refusé)
+            self.jobs[job_id] = job
+
+        if broken_executor is not None:
+            logger.error(f"Pool de processus interrompu, recréé ; job {job_id} refusé")
+            broken_executor.shutdown(wait=False, cancel_futures=True)
+            self.warm_up()
+            return job_id, job["error_msg"]
+
+        # Hors du verrou : le callback s'exécute immédiatement si le job est déjà terminé
+        future.add_done_callback(lambda f: self._on_job_done(job_id, f))
+        return job_id, None
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne une copie de l'état d'un job, ou None s'il est inconnu."""
+        with self._lock:
+            job: Optional[Dict[str, Any]] = self.jobs.get(job_id)
+            return dict(job, progress=dict(job["progress"])) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Retourne le résumé (identifiant, statut, avancement) de tous les jobs connus."""
+        with self._lock:
+            return [
+                {"job_id": job_id, "status": job["status"], "progress": dict(job["progress"])}
+                for job_id, job in self.jobs.items()
+            ]
+
+    def shutdown(self) -> None:
+        """Arrête le pool (en attendant les jobs en cours) puis le thread d'avancement."""
+        self._executor.shutdown(wait=True)
+        self._progress_queue.put(None)
+        self._progress_thread.join()
+        self._log_listener.stop()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Crée le pool de processus (chaque processus est initialisé par _init_worker)."""
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._progress_queue, self._log_queue),
+        )
+
+    def _collect_progress(self) -> None:
+        """Boucle du thread qui applique au registre les messages d'avancement des processus."""
+        while True:
+            message: Optional[Tuple[str, int, int]] = self._progress_queue.get()
+            if message is None:
+                break
+            job_id, done, total = message
+            with self._lock:
+                job: Optional[Dict[str, Any]] = self.jobs.get(job_id)
+                # Un message tardif ne doit pas faire repasser un job terminé à "running"
+                if job and job["status"] in ("queued", "running"):
+                    job["status"] = "running"
+                    job["progress"] = {"done": done, "total": total}
+
+    def _evict_finished(self) -> None:
+        """
+        Retire du registre les jobs terminés depuis plus de JOB_TTL secondes, puis les plus anciens
+        au-delà de MAX_FINISHED_JOBS. À appeler avec self._lock acquis.
+        """
+        now: float = time.time()
+        finished: List[Tuple[float, str]] = sorted(
+            (job["finished_at"], job_id) for job_id, job in self.jobs.items() if job["finished_at"] is not None
+        )
+        expired: int = sum(1 for finished_at, _ in finished if now - finished_at > JOB_TTL)
+        for _, job_id in finished[:max(expired, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _on_job_done(self, job_id: str, future: Future) -> None:
+        """Callback de fin de job : enregistre le résultat ou l'erreur."""
+        with self._lock:
+            self._evict_finished()
+            job: Dict[str, Any] = self.jobs[job_id]
+            job["finished_at"] = time.time()
+            try:
+                result: Dict[str, Any] = future.result()
+            except Exception as e:
+                logger.error(f"Échec du job {job_id}: {e}")
+                job["status"] = "failed"
+                job["error_msg"] = str(e)
+                return
+
+            job["result"] = result
+            if result["success_count"] > 0:
+                job["status"] = "done"
+                job["progress"]["done"] = job["progress"]["total"]
+            else:
+                job["status"] = "failed"
+                job["error_msg"] = result["stats"].get("error_msg", "Aucune image n'a été traitée avec succès.")
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    API HTTP locale du service :
+        POST /jobs                  -> soumet un job {"files": [...], "options": {...}, "export_path": "..."}
+        GET  /jobs                  -> liste des jobs
+        GET  /jobs/<id>             -> état complet du job
+        GET  /jobs/<id>/progress    -> avancement {"done", "total"}
+        GET  /jobs/<id>/result      -> résultat (409 tant que le job n'est pas terminé)
+        GET  /health                -> état du service
+    """
+
+    # Référence au service et jeton d'accès, définis par serve()
+    service: CompressionService
+    token: str
+    allowed_hosts: Tuple[str, ...] = LOCAL_HOSTS
+
+    def _authorize(self) -> bool:
+        """
+        Vérifie qu'une requête vient d'un client local autorisé : en-tête Host local
+        et jeton d'accès. Envoie la réponse d'erreur sinon.
+
+        Returns:
+            True si la requête peut être traitée.
+        """
+        host: str = self.headers.get("Host", "").strip().lower()
+        # Retire le port éventuel ("127.0.0.1:8765", "[::1]:8765")
+        hostname: str = host.split("]")[0] + "]" if host.startswith("[") else host.split(":")[0]
+        if hostname not in self.allowed_hosts:
+            self._send_json(403, {"error_msg": "Hôte non autorisé."})
+            return False
+
+        authorization: str = self.headers.get("Authorization", "")
+        if not hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {self.token}".encode("utf-8")):
+            self._send_json(401, {"error_msg": "Jeton d'accès manquant ou invalide."})
+            return False
+        return True
+
+    def do_POST(self) -> None:
+        if not self._authorize():
+            return
+        # Un formulaire ou un fetch "simple" (sans requête préalable CORS) ne peut pas envoyer ce type
+        content_type: str = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self._send_json(415, {"error_msg": "Le corps doit être de type application/json."})
+            return
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error_msg": "Ressource inconnue."})
+            return
+
+        try:
+            length: int = int(self.headers.get("Content-Length", 0))
+            payload: Any = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error_msg": "Corps JSON invalide."})
+            return
+
+        if not isinstance(payload, dict):
+            self._send_json(400, {"error_msg": "Le corps doit être un objet JSON."})
+            return
+
+        files: Any = payload.get("files")
+        if not files or not isinstance(files, list) or not all(isinstance(f, str) for f in files):
+            self._send_json(400, {"error_msg": "'files' doit être une liste non vide de chemins."})
+            return
+
+        export_path: Any = payload.get("export_path", "")
+        if not isinstance(export_path, str):
+            self._send_json(400, {"error_msg": "'export_path' doit être une chaîne."})
+            return
+
+        options: Any = payload.get("options", {})
+        error_msg: Optional[str] = ApplicationModel.validate_options(options)
+        if error_msg:
+            self._send_json(400, {"error_msg": error_msg})
+            return
+
+        job_id, error_msg = self.service.submit(files, options, export_path)
+        if error_msg:
+            # Pool recréé : le client peut soumettre à nouveau
+            self._send_json(503, {"job_id": job_id, "status": "failed", "error_msg": error_msg})
+            return
+        self._send_json(202, {"job_id": job_id, "status": "queued"})
+
+    def do_GET(self) -> None:
+        if not self._authorize():
+            return
+        parts: List[str] = [p for p in self.path.split("?")[0].split("/") if p]
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "workers": self.service.workers})
+            return
+        if parts == ["jobs"]:
+            self._send_json(200, {"jobs": self.service.list_jobs()})
+            return
+        if len(parts) not in (2, 3) or parts[0] != "jobs":
+            self._send_json(404, {"error_msg": "Ressource inconnue."})
+            return
+
+        job: Optional[Dict[str, Any]] = self.service.get_job(parts[1])
+        if job is None:
+            self._send_json(404, {"error_msg": "Job inconnu."})
+            return
+
+        if len(parts) == 2:
+            self._send_json(200, job)
+        elif parts[2] == "progress":
+            self._send_json(200, {"job_id": job["job_id"], "status": job["status"], **job["progress"]})
+        elif parts[2] == "result":
+            if job["status"] not in ("done", "failed"):
+                self._send_json(409, {"job_id": job["job_id"], "status": job["status"]})
+            else:
+                self._send_json(200, {
+                    "job_id": job["job_id"],
+                    "status": job["status"],
+                    "error_msg": job["error_msg"],
+                    "result": job["result"],
+                })
+        else:
+            self._send_json(404, {"error_msg": "Ressource inconnue."})
+
+    def _send_json(self, code: int, body: Dict[str, Any]) -> None:
+        """Envoie une réponse JSON avec le code HTTP donné."""
+        data: bytes = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Redirige le journal d'accès de http.server vers le logger de l'application
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: Optional[int] = None) -> None:
+    """
+    Démarre le service de compression et son API HTTP locale, jusqu'à interruption (Ctrl+C).
+
+    Args:
+        host: Adresse d'écoute (localhost par défaut, le service n'est pas destiné au réseau).
+        port: Port d'écoute.
+        workers: Nombre de processus du pool.
+    """
+    service: CompressionService = CompressionService(workers)
+    service.warm_up()
+
+    handler = type("JobRequestHandler", (_JobRequestHandler,), {
+        "service": service,
+        "token": read_token(),
+        "allowed_hosts": tuple(dict.fromkeys(LOCAL_HOSTS + (host.lower(),))),
+    })
+    server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), handler)
+    print(f"Service de compression à l'écoute sur http://{host}:{server.server_port} ({service.workers} processus)")
+    print(f"Jeton d'accès : {get_writable_path(TOKEN_FILE)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Service local de compression d'images (pool de processus chaud).")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute (défaut: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port d'écoute (défaut: 8765)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: nombre de CPU)")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers)
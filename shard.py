@@ -0,0 +1,657 @@
+import os
+import io
+import sys
+import json
+import time
+import uuid
+import queue
+import shlex
+import shutil
+import logging
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from mvc.model import ApplicationModel
+from mvc.journal import BatchJournal, fsync_path, fsync_directory
+from mvc.logging_config import setup_logging
+from utils import get_writable_path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows : pas de verrou de shard (les exécuteurs y sont locaux, tués avec leur processus)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# Dossier de travail des lots répartis, dans le dossier d'exportation (donc sur le même système
+# de fichiers : les sorties y sont publiées par simple renommage) :
+#   .shards/<batch_id>/<shard_id>.json          manifeste du shard
+#   .shards/<batch_id>/<shard_id>.result.json   résultat écrit par le processus de travail
+#   .shards/<batch_id>/<shard_id>/              sorties du shard, avant la fusion
+#   .shards/<batch_id>/<shard_id>.log           journaux du processus de travail (et .events.jsonl)
+SHARDS_DIR: str = ".shards"
+
+# Dossier RELATIF (à côté de l'exécutable) où le coordinateur range les journaux des shards fusionnés
+SHARD_LOGS_DIR: str = "logs/shards"
+
+# Nombre de lignes de la sortie d'erreur d'un shard en échec conservées dans le journal
+STDERR_TAIL_LINES: int = 20
+
+# Code de sortie d'un processus de travail qui trouve son shard déjà traité par une autre tentative
+# (EX_TEMPFAIL : le shard sera relancé après l'attente habituelle)
+EXIT_BUSY: int = 75
+
+# Délai (en secondes) laissé à un processus distant après SIGTERM avant SIGKILL, et marge
+# du délai local de ssh (connexion) au-delà du délai imposé sur l'hôte distant
+KILL_AFTER: float = 10.0
+SSH_MARGIN: float = 30.0
+
+
+# --- Manifestes ---
+
+def plan_shards(
+    files: List[str],
+    options: Dict[str, Any],
+    export_path: str,
+    shard_count: int,
+    batch_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Répartit un lot en shards de volumes équilibrés et écrit leurs manifestes.
+    Les plus gros fichiers sont placés en premier, chacun dans le shard le moins chargé
+    ne contenant pas encore d'image de même nom.
+
+    Args:
+        files: Chemins des images du lot (les doublons sont ignorés).
+        options: Options de compression (schéma ApplicationModel.DEFAULT_OPTIONS).
+        export_path: Dossier d'exportation final (partagé par tous les hôtes, au même chemin).
+        shard_count: Nombre de shards souhaité (réduit au nombre d'images si nécessaire, augmenté
+            si des images homonymes sont plus nombreuses que les shards).
+        batch_id: Identifiant du lot réparti (généré si None).
+
+    Returns:
+        Les manifestes des shards non vides.
+    """
+    batch_id = batch_id or uuid.uuid4().hex
+    staging_root: str = os.path.join(os.path.abspath(export_path), SHARDS_DIR, batch_id)
+    os.makedirs(staging_root, exist_ok=True)
+
+    sized: List[Tuple[int, str]] = []
+    for path in dict.fromkeys(os.path.abspath(f) for f in files):
+        try:
+            sized.append((os.path.getsize(path), path))
+        except OSError:
+            # Fichier absent : laissé au shard, qui le signalera dans son rapport
+            sized.append((0, path))
+    sized.sort(reverse=True)
+
+    shard_count = max(1, min(shard_count, len(sized)))
+    buckets: List[List[str]] = [[] for _ in range(shard_count)]
+    loads: List[int] = [0] * shard_count
+    # Noms de base présents dans chaque shard : un shard nomme ses sorties d'après le nom de l'original,
+    # deux images homonymes (de dossiers différents) y écraseraient donc la même sortie
+    stems: List[set] = [set() for _ in range(shard_count)]
+    for size, path in sized:
+        stem: str = os.path.splitext(os.path.basename(path))[0].lower()
+        candidates: List[int] = [i for i in range(len(buckets)) if stem not in stems[i]]
+        if not candidates:
+            # Plus d'homonymes que de shards : un shard supplémentaire est créé
+            buckets.append([])
+            loads.append(0)
+            stems.append(set())
+            candidates = [len(buckets) - 1]
+        index: int = min(candidates, key=lambda i: loads[i])
+        buckets[index].append(path)
+        loads[index] += size
+        stems[index].add(stem)
+
+    manifests: List[Dict[str, Any]] = []
+    for index, bucket in enumerate(buckets):
+        if not bucket:
+            continue
+        shard_id: str = f"shard-{index:04d}"
+        manifest: Dict[str, Any] = {
+            "batch_id": batch_id,
+            "shard_id": shard_id,
+            "index": index,
+            "files": bucket,
+            "options": options,
+            # Dossier propre au shard : deux shards ne peuvent pas écrire le même fichier
+            "export_path": os.path.join(staging_root, shard_id),
+            # Préfixe appliqué à la fusion aux noms déjà pris par un autre shard
+            "output_prefix": f"s{index:04d}_",
+            "manifest_path": os.path.join(staging_root, f"{shard_id}.json"),
+            "result_path": os.path.join(staging_root, f"{shard_id}.result.json"),
+            # Journaux propres au shard : les fichiers de logs/ n'ont qu'un seul écrivain, le coordinateur
+            "log_file": os.path.join(staging_root, f"{shard_id}.log"),
+            "events_file": os.path.join(staging_root, f"{shard_id}.events.jsonl"),
+        }
+        os.makedirs(manifest["export_path"], exist_ok=True)
+        _write_json(manifest["manifest_path"], manifest)
+        manifests.append(manifest)
+    return manifests
+
+
+def _write_json(path: str, obj: Any) -> None:
+    """Écrit un fichier JSON de manière atomique et durable (fichier .part, fsync, renommage)."""
+    temp_path: str = f"{path}.part"
+    with io.open(temp_path, mode="w", encoding="utf-8") as f:
+        json.dump(obj=obj, fp=f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    fsync_directory(os.path.dirname(path))
+
+
+def _read_json(path: str) -> Optional[Any]:
+    """Relit un fichier JSON, ou None s'il est absent ou illisible."""
+    try:
+        with io.open(path, mode="r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+# --- Côté processus de travail (un shard) ---
+
+def run_shard(manifest_path: str) -> int:
+    """
+    Traite un shard décrit par son manifeste et écrit son résultat à côté du manifeste.
+    Si une tentative précédente du shard a été interrompue sur cet hôte, son lot est repris
+    depuis le journal (les originaux déjà supprimés ne sont pas recherchés une seconde fois).
+
+    Une seule tentative à la fois traite un shard : chacune prend un verrou exclusif à côté
+    du dossier du shard. Une tentative précédente encore vivante (hôte injoignable, processus
+    distant pas encore arrêté) fait donc échouer la nouvelle, au lieu d'écrire en même temps
+    qu'elle dans le même dossier et le même journal.
+
+    Args:
+        manifest_path: Chemin du manifeste (voir plan_shards).
+
+    Returns:
+        Le code de sortie du processus : 0 si au moins une image a été traitée, EXIT_BUSY si
+        une autre tentative traite le shard, 1 sinon.
+    """
+    manifest: Optional[Dict[str, Any]] = _read_json(manifest_path)
+    if manifest is None:
+        logger.error(f"Manifeste de shard illisible: {manifest_path}")
+        return 1
+
+    # Le verrou est posé sur le système de fichiers partagé (sous Linux, flock() sur NFS
+    # est converti en verrou POSIX, visible de tous les clients)
+    with open(f"{manifest['export_path']}.lock", mode="a") as lock_file:
+        if fcntl:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                logger.error(f"Shard {manifest['shard_id']} déjà en cours de traitement par une autre tentative")
+                return EXIT_BUSY
+
+        # Une tentative précédente a pu aller au bout après avoir été abandonnée (délai dépassé)
+        result: Optional[Dict[str, Any]] = _read_json(manifest["result_path"])
+        if result and result["success_count"] > 0:
+            logger.info(f"Shard {manifest['shard_id']} déjà terminé")
+            return 0
+        return _process_shard(manifest)
+
+
+def _process_shard(manifest: Dict[str, Any]) -> int:
+    """Traite (ou reprend) le lot d'un shard et écrit son résultat ; voir run_shard."""
+    model: ApplicationModel = ApplicationModel(setup_export=False)
+    # Le dossier du shard identifie sans ambiguïté le journal d'une tentative précédente
+    previous: Optional[str] = next(iter(BatchJournal.unfinished(export_path=manifest["export_path"])), None)
+    loaded: int
+    if previous:
+        logger.info(f"Reprise du shard {manifest['shard_id']} (lot {previous})")
+        loaded = len(manifest["files"])
+        success_count, stats = model.resume_batch(previous)
+    else:
+        loaded = model.load_images(manifest["files"])
+        model.export_path = manifest["export_path"]
+        success_count, stats = model.process_and_export(manifest["options"])
+    model.reset_data()
+
+    _write_json(manifest["result_path"], {
+        "shard_id": manifest["shard_id"],
+        "loaded": loaded,
+        "success_count": success_count,
+        "stats": stats,
+    })
+    return 0 if success_count > 0 else 1
+
+
+# --- Exécution des shards ---
+
+class LocalRunner:
+    """
+    Lance chaque shard dans un sous-processus Python local (shard.py --worker <manifeste>).
+    Même protocole que SSHRunner (manifeste et résultat sur le système de fichiers) :
+    il sert de remplaçant local pour les essais, et de répartition sur les cœurs d'une seule machine.
+    """
+
+    def __init__(self, python: str = sys.executable, workdir: Optional[str] = None,
+                 cwd: Optional[str] = None) -> None:
+        """
+        Args:
+            python: Interpréteur utilisé pour les processus de travail.
+            workdir: Dossier de l'application (par défaut, celui de ce script).
+            cwd: Dossier courant des processus de travail, où sont écrits journaux et réglages
+                (par défaut, workdir).
+        """
+        self.python: str = python
+        self.workdir: str = workdir or os.path.dirname(os.path.abspath(__file__))
+        self.cwd: str = cwd or self.workdir
+
+    def run(self, manifest_path: str, timeout: Optional[float] = None) -> Tuple[int, str]:
+        """
+        Exécute un shard et attend sa fin.
+
+        Args:
+            manifest_path: Chemin du manifeste du shard.
+            timeout: Durée maximale (en secondes) ; le processus est tué au-delà.
+
+        Returns:
+            (code de sortie, sortie d'erreur du processus).
+        """
+        return self._execute(
+            [self.python, os.path.join(self.workdir, "shard.py"), "--worker", manifest_path], self.cwd, timeout
+        )
+
+    @staticmethod
+    def _execute(command: List[str], cwd: Optional[str], timeout: Optional[float]) -> Tuple[int, str]:
+        """Exécute une commande ; un dépassement de délai est rapporté comme un échec (code -1)."""
+        try:
+            completed: subprocess.CompletedProcess = subprocess.run(
+                command, cwd=cwd, capture_output=True, text=True, timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return -1, f"Délai dépassé ({timeout} s)"
+        except OSError as e:
+            return -1, str(e)
+        return completed.returncode, completed.stderr
+
+
+class SSHRunner(LocalRunner):
+    """
+    Lance chaque shard sur un hôte distant par SSH. Les hôtes doivent voir les images, les manifestes
+    et le dossier d'exportation aux mêmes chemins (système de fichiers partagé), et disposer de
+    l'application dans remote_dir. Chaque hôte traite au plus slots shards à la fois ; un shard
+    relancé après un échec prend le premier hôte libre, pas forcément le même.
+    """
+
+    def __init__(self, hosts: List[str], remote_dir: str, python: str = "python3", slots: int = 1) -> None:
+        """
+        Args:
+            hosts: Hôtes SSH ("machine" ou "utilisateur@machine").
+            remote_dir: Dossier de l'application sur les hôtes.
+            python: Interpréteur distant.
+            slots: Nombre de shards exécutés simultanément par hôte.
+
+        Raises:
+            ValueError: Si aucun hôte n'est donné.
+        """
+        if not hosts:
+            raise ValueError("Au moins un hôte SSH est nécessaire.")
+        super().__init__(python, remote_dir)
+        self.hosts: List[str] = hosts
+        self._free_hosts: "queue.Queue[str]" = queue.Queue()
+        for _ in range(slots):
+            for host in hosts:
+                self._free_hosts.put(host)
+
+    def run(self, manifest_path: str, timeout: Optional[float] = None) -> Tuple[int, str]:
+        """
+        Exécute un shard sur le premier hôte libre. Le délai est imposé sur l'hôte distant
+        (commande timeout) : tuer le client ssh local n'arrêterait pas le processus distant.
+        """
+        host: str = self._free_hosts.get()
+        try:
+            command: List[str] = [self.python, "shard.py", "--worker", manifest_path]
+            local_timeout: Optional[float] = None
+            if timeout:
+                command = ["timeout", "--kill-after", f"{KILL_AFTER:g}", f"{timeout:g}"] + command
+                # Le client ssh n'est tué qu'après l'arrêt certain du processus distant
+                local_timeout = timeout + KILL_AFTER + SSH_MARGIN
+            remote_command: str = f"cd {shlex.quote(self.workdir)} && exec {shlex.join(command)}"
+            # BatchMode : échoue au lieu d'attendre un mot de passe
+            returncode, stderr = self._execute(["ssh", "-o", "BatchMode=yes", host, remote_command], None, local_timeout)
+            if timeout and returncode in (124, 137):
+                # Codes de sortie de timeout (délai dépassé, puis SIGKILL)
+                return -1, f"Délai dépassé ({timeout} s) sur {host}"
+            return returncode, stderr
+        finally:
+            self._free_hosts.put(host)
+
+
+def _run_with_retries(
+    manifest: Dict[str, Any],
+    runner: LocalRunner,
+    retries: int,
+    timeout: Optional[float],
+    retry_delay: float
+) -> Dict[str, Any]:
+    """
+    Exécute un shard jusqu'à son succès ou l'épuisement des tentatives.
+
+    Returns:
+        L'état du shard : {"shard_id", "status", "attempts", "error_msg", "result"}.
+    """
+    outcome: Dict[str, Any] = {"shard_id": manifest["shard_id"], "status": "failed", "attempts": 0,
+                               "error_msg": None, "result": None}
+    for attempt in range(retries + 1):
+        if attempt:
+            # Attente croissante avant de relancer (hôte surchargé, partage momentanément indisponible...)
+            time.sleep(retry_delay * attempt)
+        outcome["attempts"] = attempt + 1
+        start: float = time.perf_counter()
+        returncode, stderr = runner.run(manifest["manifest_path"], timeout)
+
+        result: Optional[Dict[str, Any]] = _read_json(manifest["result_path"])
+        if returncode == 0 and result and result["success_count"] > 0:
+            outcome.update(status="done", result=result, error_msg=None)
+            logger.info(
+                f"Shard {manifest['shard_id']} terminé en {time.perf_counter() - start:.1f} s "
+                f"(tentative {attempt + 1})"
+            )
+            return outcome
+
+        error_msg: str = (result or {}).get("stats", {}).get("error_msg") or \
+            "\n".join(stderr.strip().splitlines()[-STDERR_TAIL_LINES:]) or f"code de sortie {returncode}"
+        outcome["error_msg"] = error_msg
+        logger.error(f"Échec du shard {manifest['shard_id']} (tentative {attempt + 1}/{retries + 1}): {error_msg}")
+    return outcome
+
+
+# --- Fusion ---
+
+def _claim_name(name: str, prefix: str, claimed: set) -> str:
+    """Retourne un nom de sortie encore libre : le nom d'origine, ou le nom préfixé par le shard."""
+    candidate: str = name
+    counter: int = 1
+    while candidate in claimed:
+        candidate = f"{prefix}{name}" if counter == 1 else f"{prefix}{counter}_{name}"
+        counter += 1
+    claimed.add(candidate)
+    return candidate
+
+
+def _merge_files(export_path: str, manifests: List[Dict[str, Any]]) -> None:
+    """Publie dans le dossier d'exportation les fichiers des shards (renommage, sans copie)."""
+    claimed: set = set()
+    for manifest in manifests:
+        with os.scandir(manifest["export_path"]) as entries:
+            names: List[str] = sorted(e.name for e in entries if e.is_file() and not e.name.endswith(".part"))
+        for name in names:
+            final_name: str = _claim_name(name, manifest["output_prefix"], claimed)
+            os.replace(os.path.join(manifest["export_path"], name), os.path.join(export_path, final_name))
+    fsync_directory(export_path)
+
+
+def _merge_zips(zip_path: str, zip_parts: List[Tuple[str, str]]) -> None:
+    """
+    Réunit les ZIP des shards en un seul fichier, chaque entrée gardant sa méthode de compression.
+
+    Args:
+        zip_path: Chemin du ZIP final.
+        zip_parts: Liste de (chemin du ZIP d'un shard, préfixe de ce shard).
+    """
+    from zipfile import ZipFile, ZipInfo
+
+    claimed: set = set()
+    temp_path: str = f"{zip_path}.part"
+    with ZipFile(temp_path, "w") as merged:
+        for part_path, prefix in zip_parts:
+            with ZipFile(part_path, "r") as part:
+                for info in part.infolist():
+                    target: ZipInfo = ZipInfo(_claim_name(info.filename, prefix, claimed), info.date_time)
+                    target.compress_type = info.compress_type
+                    target.file_size = info.file_size
+                    # Copie par blocs : une entrée n'est jamais entièrement chargée en mémoire
+                    with part.open(info) as source, merged.open(target, "w") as destination:
+                        shutil.copyfileobj(source, destination, 1024 * 1024)
+    fsync_path(temp_path)
+    os.replace(temp_path, zip_path)
+    fsync_directory(os.path.dirname(zip_path))
+
+
+def merge_shards(
+    export_path: str,
+    manifests: List[Dict[str, Any]],
+    outcomes: List[Dict[str, Any]]
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Fusionne les sorties et les statistiques des shards réussis en un seul résultat, de même forme
+    que celui de ApplicationModel.process_and_export. Les dossiers des shards en échec sont conservés
+    (leurs images n'ont pas été traitées, ou seulement en partie).
+
+    Args:
+        export_path: Dossier d'exportation final.
+        manifests: Les manifestes des shards (voir plan_shards).
+        outcomes: Les états des shards, dans le même ordre.
+
+    Returns:
+        Un tuple (nombre de succès, statistiques fusionnées).
+    """
+    done: List[Tuple[Dict[str, Any], Dict[str, Any]]] = [
+        (manifest, outcome["result"]) for manifest, outcome in zip(manifests, outcomes) if outcome["status"] == "done"
+    ]
+    batch_id: str = manifests[0]["batch_id"]
+    staging_root: str = os.path.dirname(manifests[0]["manifest_path"])
+
+    results: List[Dict[str, Any]] = []
+    success_count: int = 0
+    totals: Dict[str, int] = {"old": 0, "new": 0, "resumed": 0, "kept": 0, "skipped": 0}
+    renditions: Dict[str, Dict[str, int]] = {}
+    presets: Dict[str, int] = {}
+    zip_parts: List[Tuple[str, str]] = []
+    for manifest, result in done:
+        stats: Dict[str, Any] = result["stats"]
+        results.extend(stats.get("results", []))
+        success_count += result["success_count"]
+        totals["old"] += stats.get("total_old_bytes", 0)
+        totals["new"] += stats.get("total_new_bytes", 0)
+        totals["resumed"] += stats.get("resumed_count", 0)
+        totals["kept"] += stats.get("kept_count", 0)
+        totals["skipped"] += stats.get("skipped_count", 0)
+        for name, r in stats.get("renditions", {}).items():
+            renditions.setdefault(name, {"count": 0, "new_size": 0})
+            renditions[name]["count"] += r["count"]
+            renditions[name]["new_size"] += r["new_bytes"]
+        for name, count in stats.get("presets", {}).items():
+            presets[name] = presets.get(name, 0) + count
+        if stats.get("zip_path"):
+            zip_parts.append((stats["zip_path"], manifest["output_prefix"]))
+
+    # Publication des sorties : un seul ZIP, ou les fichiers de tous les shards dans le dossier final
+    zip_path: Optional[str] = None
+    if zip_parts:
+        zip_path = os.path.join(export_path, f"{batch_id}.zip")
+        _merge_zips(zip_path, zip_parts)
+        # Comme pour un lot simple, la taille finale est celle du ZIP
+        totals["new"] = os.path.getsize(zip_path)
+    else:
+        _merge_files(export_path, [manifest for manifest, _ in done])
+
+    # Les sorties publiées, le dossier de travail des shards réussis n'est plus utile ;
+    # leurs journaux sont rangés avec ceux du coordinateur
+    log_dir: str = os.path.dirname(get_writable_path(f"{SHARD_LOGS_DIR}/{batch_id}/_"))
+    for manifest, _ in done:
+        for path in (manifest["log_file"], manifest["events_file"]):
+            if os.path.exists(path):
+                shutil.move(path, os.path.join(log_dir, os.path.basename(path)))
+        shutil.rmtree(manifest["export_path"], ignore_errors=True)
+        for path in (manifest["manifest_path"], manifest["result_path"], f"{manifest['export_path']}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+    if len(done) == len(manifests):
+        shutil.rmtree(staging_root, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(staging_root))
+        except OSError:
+            # Autres lots répartis en cours dans le même dossier d'exportation
+            pass
+
+    stats = {
+        "results": results,
+        "batch_id": batch_id,
+        "export_dir": export_path,
+        "zip_path": zip_path,
+        "log_dir": log_dir,
+        "shards": [
+            {key: outcome[key] for key in ("shard_id", "status", "attempts", "error_msg")}
+            | {"files": len(manifest["files"])}
+            for manifest, outcome in zip(manifests, outcomes)
+        ],
+        # Images des shards en échec, à relancer (leur dossier de travail est conservé)
+        "failed_files": [
+            path for manifest, outcome in zip(manifests, outcomes) if outcome["status"] != "done"
+            for path in manifest["files"]
+        ],
+    }
+    if success_count > 0:
+        gain_bytes: int = totals["old"] - totals["new"]
+        stats.update({
+            "total_old_mo": round(totals["old"] / 1000000, 2),
+            "total_new_mo": round(totals["new"] / 1000000, 2),
+            "difference_mo": round(gain_bytes / 1000000, 2),
+            "gain_percent": round(gain_bytes / totals["old"] * 100, 1) if totals["old"] else 0,
+            "total_old_bytes": totals["old"],
+            "total_new_bytes": totals["new"],
+            "resumed_count": totals["resumed"],
+            "kept_count": totals["kept"],
+            "skipped_count": totals["skipped"],
+            "renditions": {
+                name: {"count": r["count"], "total_new_mo": round(r["new_size"] / 1000000, 2), "new_bytes": r["new_size"]}
+                for name, r in renditions.items()
+            },
+            "presets": presets,
+        })
+    else:
+        stats["error_msg"] = "Aucun shard n'a pu être traité."
+    return success_count, stats
+
+
+def process_sharded(
+    files: List[str],
+    options: Dict[str, Any],
+    export_path: str,
+    shard_count: int,
+    runner: Optional[LocalRunner] = None,
+    parallel: Optional[int] = None,
+    retries: int = 2,
+    timeout: Optional[float] = None,
+    retry_delay: float = 1.0,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Compresse un lot réparti en shards traités par des processus indépendants (locaux ou distants),
+    puis fusionne leurs sorties et statistiques.
+
+    Args:
+        files: Chemins des images du lot.
+        options: Options de compression (schéma ApplicationModel.DEFAULT_OPTIONS).
+        export_path: Dossier d'exportation final.
+        shard_count: Nombre de shards.
+        runner: Exécuteur des shards (LocalRunner par défaut).
+        parallel: Nombre de shards exécutés simultanément (par défaut, tous).
+        retries: Nombre de relances d'un shard en échec.
+        timeout: Durée maximale d'une tentative (en secondes).
+        retry_delay: Attente avant la première relance (croissante ensuite).
+        progress_callback: Fonction optionnelle appelée à la fin de chaque shard avec
+            (nombre d'images des shards terminés, nombre total d'images).
+
+    Returns:
+        Le même tuple que ApplicationModel.process_and_export, avec en plus l'état de chaque shard
+        ("shards") et les images des shards en échec ("failed_files").
+    """
+    if not files or not export_path or not os.path.isdir(export_path):
+        return 0, {"error_msg": "Données manquantes ou chemin d'exportation invalide."}
+    error_msg: Optional[str] = ApplicationModel.validate_options(options)
+    if error_msg:
+        return 0, {"error_msg": error_msg}
+
+    export_path = os.path.abspath(export_path)
+    runner = runner or LocalRunner()
+    manifests: List[Dict[str, Any]] = plan_shards(files, options, export_path, shard_count)
+    total_files: int = sum(len(m["files"]) for m in manifests)
+    logger.info(f"Lot {manifests[0]['batch_id']} réparti en {len(manifests)} shard(s) ({total_files} images)")
+
+    done_files: int = 0
+    with ThreadPoolExecutor(max_workers=parallel or len(manifests)) as executor:
+        futures: Dict[Future, Dict[str, Any]] = {
+            executor.submit(_run_with_retries, manifest, runner, retries, timeout, retry_delay): manifest
+            for manifest in manifests
+        }
+        # Avancement dans l'ordre de fin des shards
+        for future in as_completed(futures):
+            done_files += len(futures[future]["files"])
+            if progress_callback:
+                progress_callback(done_files, total_files)
+        outcomes: List[Dict[str, Any]] = [future.result() for future in futures]
+
+    return merge_shards(export_path, manifests, outcomes)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Compresse un grand lot d'images en le répartissant en shards (processus locaux ou hôtes SSH)."
+    )
+    parser.add_argument("files", nargs="*", help="Images à compresser")
+    parser.add_argument("--export", default="", help="Dossier d'exportation (défaut: dossier sauvegardé)")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="Nombre de shards (défaut: nombre de CPU)")
+    parser.add_argument("--parallel", type=int, default=None, help="Shards exécutés simultanément (défaut: tous)")
+    parser.add_argument("--retries", type=int, default=2, help="Relances d'un shard en échec (défaut: 2)")
+    parser.add_argument("--timeout", type=float, default=None, help="Durée maximale d'une tentative en secondes")
+    parser.add_argument("--hosts", default="", help="Hôtes SSH séparés par des virgules (défaut: processus locaux)")
+    parser.add_argument("--remote-dir", default="", help="Dossier de l'application sur les hôtes (défaut: le même)")
+    parser.add_argument("--remote-python", default="python3", help="Interpréteur distant (défaut: python3)")
+    parser.add_argument("--slots", type=int, default=1, help="Shards simultanés par hôte SSH (défaut: 1)")
+    parser.add_argument("--worker", metavar="MANIFESTE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Processus de travail lancé par un exécuteur : traite un seul shard, avec ses propres
+        # fichiers de journaux (plusieurs processus ne doivent pas faire tourner les mêmes fichiers)
+        worker_manifest: Optional[Dict[str, Any]] = _read_json(args.worker)
+        if worker_manifest:
+            setup_logging(log_file=worker_manifest["log_file"], events_file=worker_manifest["events_file"], rotate=False)
+        sys.exit(run_shard(args.worker))
+
+    setup_logging()
+
+    model: ApplicationModel = ApplicationModel()
+    runner: LocalRunner = LocalRunner()
+    if args.hosts:
+        runner = SSHRunner(
+            [h.strip() for h in args.hosts.split(",") if h.strip()],
+            args.remote_dir or os.path.dirname(os.path.abspath(__file__)),
+            python=args.remote_python,
+            slots=args.slots,
+        )
+
+    success_count, stats = process_sharded(
+        args.files,
+        model.read_options(),
+        args.export or model.export_path,
+        args.shards,
+        runner=runner,
+        parallel=args.parallel,
+        retries=args.retries,
+        timeout=args.timeout,
+        progress_callback=lambda done, total: print(f"{done}/{total} images"),
+    )
+    if success_count:
+        print(
+            f"{success_count} image(s) exportée(s) : {stats['total_old_mo']:.2f} Mo -> {stats['total_new_mo']:.2f} Mo "
+            f"({stats['gain_percent']} %) dans {stats['zip_path'] or stats['export_dir']}"
+        )
+    for shard in stats.get("shards", []):
+        if shard["status"] != "done":
+            print(f"Shard {shard['shard_id']} en échec après {shard['attempts']} tentative(s): {shard['error_msg']}")
+    if not success_count:
+        print(f"Échec : {stats.get('error_msg')}")
+    sys.exit(0 if success_count and not stats["failed_files"] else 1)
@@ -0,0 +1,103 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+from typing import Dict, Any, List
+
+from PIL import Image
+
+REPO_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from mvc.journal import BatchJournal, fcntl
+from mvc.model import ApplicationModel
+
+# Lot interrompu brutalement (comme une coupure de courant) après deux images sur quatre
+CRASHING_BATCH: str = """
+import os, sys
+sys.path.insert(0, {repo!r})
+from mvc.model import ApplicationModel
+
+def crash(done, total):
+    if done == 2:
+        os._exit(1)
+
+model = ApplicationModel(setup_export=False)
+model.load_images({files!r})
+model.export_path = {export_path!r}
+model.process_and_export({{"output_format": "JPG", "delete_originals": True}}, progress_callback=crash)
+"""
+
+
+def _make_image(path: str, width: int = 320, height: int = 240) -> str:
+    """Crée une image PNG de test (fractale : compressible, mais pas uniforme)."""
+    Image.effect_mandelbrot((width, height), (-2, -1.5, 1, 1.5), 40).convert("RGB").save(path)
+    return path
+
+
+@unittest.skipUnless(fcntl, "verrous de journal indisponibles sur ce système")
+class JournalResumeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Journaux et réglages sont écrits relativement au dossier courant : rien dans le dépôt
+        self.root: str = tempfile.mkdtemp()
+        self.previous_cwd: str = os.getcwd()
+        os.chdir(self.root)
+        self.export_path: str = os.path.join(self.root, "export")
+        os.makedirs(self.export_path)
+        source_dir: str = os.path.join(self.root, "source")
+        os.makedirs(source_dir)
+        self.files: List[str] = [_make_image(os.path.join(source_dir, f"img{i}.png")) for i in range(4)]
+
+    def tearDown(self) -> None:
+        os.chdir(self.previous_cwd)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _resume(self, batch_id: str) -> Dict[str, Any]:
+        model: ApplicationModel = ApplicationModel(setup_export=False)
+        success_count, stats = model.resume_batch(batch_id)
+        model.reset_data()
+        stats["success_count"] = success_count
+        return stats
+
+    def test_crashed_batch_is_resumed(self) -> None:
+        script: str = CRASHING_BATCH.format(repo=REPO_DIR, files=self.files, export_path=self.export_path)
+        process = subprocess.run([sys.executable, "-c", script], cwd=self.root, capture_output=True)
+        self.assertEqual(process.returncode, 1, process.stderr.decode(errors="replace"))
+
+        # Le processus arrêté a libéré son verrou : le lot est reconnu comme interrompu
+        unfinished: List[str] = BatchJournal.unfinished()
+        self.assertEqual(len(unfinished), 1)
+        self.assertEqual(sum(os.path.exists(f) for f in self.files), 2)
+
+        stats: Dict[str, Any] = self._resume(unfinished[0])
+
+        self.assertEqual(stats["success_count"], 4)
+        self.assertEqual(stats["resumed_count"], 2)
+        self.assertEqual(sorted(os.listdir(self.export_path)), [f"img{i}.jpg" for i in range(4)])
+        self.assertFalse(any(os.path.exists(f) for f in self.files))
+        # Lot terminé : son journal est supprimé
+        self.assertFalse(os.path.exists(BatchJournal.journal_path(unfinished[0])))
+        self.assertEqual(BatchJournal.unfinished(), [])
+
+    def test_running_batch_is_not_resumed(self) -> None:
+        journal: BatchJournal = BatchJournal.create(
+            options={"output_format": "JPG"}, files=self.files, export_path=self.export_path, zip_path=None
+        )
+
+        # Lot en cours (verrou tenu) : ni listé, ni repris
+        self.assertEqual(BatchJournal.unfinished(), [])
+        stats: Dict[str, Any] = self._resume(journal.batch_id)
+        self.assertEqual(stats["success_count"], 0)
+        self.assertIn("en cours", stats["error_msg"])
+        self.assertEqual(os.listdir(self.export_path), [])
+
+        # Le processus qui le traitait s'arrête : le lot devient reprenable
+        journal.close()
+        self.assertEqual(BatchJournal.unfinished(), [journal.batch_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
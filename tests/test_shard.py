@@ -0,0 +1,202 @@
+import os
+import sys
+import shutil
+import zipfile
+import tempfile
+import unittest
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shard
+
+
+def _make_image(path: str, width: int = 320, height: int = 240) -> str:
+    """Crée une image PNG de test (fractale : compressible, mais pas uniforme)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.effect_mandelbrot((width, height), (-2, -1.5, 1, 1.5), 40).convert("RGB").save(path)
+    return path
+
+
+class FlakyRunner(shard.LocalRunner):
+    """Exécuteur local dont la première tentative de certains shards échoue (hôte indisponible)."""
+
+    def __init__(self, failing: Tuple[str, ...]) -> None:
+        super().__init__(cwd=os.getcwd())
+        self.failing: Tuple[str, ...] = failing
+        self.calls: List[str] = []
+
+    def run(self, manifest_path: str, timeout: Optional[float] = None) -> Tuple[int, str]:
+        self.calls.append(manifest_path)
+        if os.path.basename(manifest_path) in self.failing and self.calls.count(manifest_path) == 1:
+            return 255, "ssh: connect to host: Connection refused"
+        return super().run(manifest_path, timeout)
+
+
+class ShardTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Journaux, réglages et logs sont écrits relativement au dossier courant : rien dans le dépôt
+        self.root: str = tempfile.mkdtemp()
+        self.previous_cwd: str = os.getcwd()
+        os.chdir(self.root)
+        self.export_path: str = os.path.join(self.root, "export")
+        os.makedirs(self.export_path)
+
+    def tearDown(self) -> None:
+        os.chdir(self.previous_cwd)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class PlanShardsTest(ShardTestCase):
+
+    def test_homonyms_go_to_different_shards(self) -> None:
+        files: List[str] = [_make_image(os.path.join(self.root, d, "photo.png")) for d in "abc"]
+        files.append(_make_image(os.path.join(self.root, "a", "other.png")))
+
+        manifests: List[Dict[str, Any]] = shard.plan_shards(files + files[:1], {}, self.export_path, 2)
+
+        # Trois homonymes pour deux shards demandés : un shard supplémentaire est créé
+        self.assertEqual(len(manifests), 3)
+        for manifest in manifests:
+            stems: List[str] = [os.path.basename(f) for f in manifest["files"]]
+            self.assertEqual(len(stems), len(set(stems)))
+            self.assertTrue(os.path.isfile(manifest["manifest_path"]))
+        # Les doublons du lot ne sont traités qu'une fois
+        self.assertEqual(sorted(f for m in manifests for f in m["files"]), sorted(files))
+        self.assertEqual(len({m["output_prefix"] for m in manifests}), 3)
+
+
+class MergeZipsTest(ShardTestCase):
+
+    def test_colliding_entries_are_prefixed(self) -> None:
+        parts: List[Tuple[str, str]] = []
+        for index, content in enumerate((b"premier", b"second")):
+            part_path: str = os.path.join(self.root, f"part{index}.zip")
+            with zipfile.ZipFile(part_path, "w", zipfile.ZIP_DEFLATED) as part:
+                part.writestr("photo.webp", content)
+                part.writestr(f"seul{index}.jpg", content, compress_type=zipfile.ZIP_STORED)
+            parts.append((part_path, f"s{index:04d}_"))
+
+        zip_path: str = os.path.join(self.export_path, "lot.zip")
+        shard._merge_zips(zip_path, parts)
+
+        with zipfile.ZipFile(zip_path) as merged:
+            self.assertEqual(
+                sorted(merged.namelist()), ["photo.webp", "s0001_photo.webp", "seul0.jpg", "seul1.jpg"]
+            )
+            self.assertEqual(merged.read("photo.webp"), b"premier")
+            self.assertEqual(merged.read("s0001_photo.webp"), b"second")
+            # Chaque entrée garde sa méthode de compression
+            self.assertEqual(merged.getinfo("seul1.jpg").compress_type, zipfile.ZIP_STORED)
+            self.assertIsNone(merged.testzip())
+        self.assertFalse(os.path.exists(f"{zip_path}.part"))
+
+
+class ProcessShardedTest(ShardTestCase):
+
+    def _run(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, Any]]:
+        # Processus de travail lancés dans le dossier temporaire, comme le coordinateur
+        kwargs.setdefault("runner", shard.LocalRunner(cwd=self.root))
+        success_count, stats = shard.process_sharded(*args, **kwargs)
+        self.assertTrue(stats.get("log_dir", self.root).startswith(self.root))
+        return success_count, stats
+
+    def _files(self) -> List[str]:
+        return [_make_image(os.path.join(self.root, d, f"img{i}.png")) for d in "ab" for i in range(3)]
+
+    def test_failed_shard_is_retried_and_outputs_merged(self) -> None:
+        runner: FlakyRunner = FlakyRunner(failing=("shard-0001.json",))
+
+        success_count, stats = self._run(
+            self._files(), {"output_format": "JPG"}, self.export_path, 2, runner=runner, retry_delay=0
+        )
+
+        self.assertEqual(success_count, 6)
+        self.assertEqual(stats["failed_files"], [])
+        attempts: Dict[str, int] = {s["shard_id"]: s["attempts"] for s in stats["shards"]}
+        self.assertEqual(attempts["shard-0001"], 2)
+        # Homonymes de dossiers différents : six sorties distinctes, aucune écrasée
+        outputs: List[str] = sorted(os.listdir(self.export_path))
+        self.assertEqual(len(outputs), 6)
+        self.assertTrue(all(name.endswith(".jpg") for name in outputs))
+        self.assertEqual(stats["total_new_bytes"], sum(
+            os.path.getsize(os.path.join(self.export_path, name)) for name in outputs
+        ))
+        # Chaque processus de travail a écrit ses propres journaux, rangés par le coordinateur
+        self.assertEqual(
+            sorted(os.listdir(stats["log_dir"])),
+            ["shard-0000.events.jsonl", "shard-0000.log", "shard-0001.events.jsonl", "shard-0001.log"]
+        )
+
+    def test_zip_parts_are_merged(self) -> None:
+        success_count, stats = self._run(
+            self._files(), {"output_format": "JPG", "use_zip": True}, self.export_path, 2
+        )
+
+        self.assertEqual(success_count, 6)
+        self.assertEqual(os.listdir(self.export_path), [os.path.basename(stats["zip_path"])])
+        with zipfile.ZipFile(stats["zip_path"]) as merged:
+            self.assertEqual(len(merged.namelist()), 6)
+        self.assertEqual(stats["total_new_bytes"], os.path.getsize(stats["zip_path"]))
+
+    def test_shard_failing_every_attempt_keeps_its_staging(self) -> None:
+        runner: FlakyRunner = FlakyRunner(failing=())
+        runner.run = lambda manifest_path, timeout=None: (1, "hôte indisponible")
+
+        success_count, stats = self._run(
+            self._files()[:2], {}, self.export_path, 1, runner=runner, retries=1, retry_delay=0
+        )
+
+        self.assertEqual(success_count, 0)
+        self.assertEqual(stats["shards"][0]["attempts"], 2)
+        self.assertEqual(len(stats["failed_files"]), 2)
+        self.assertTrue(os.path.isdir(os.path.join(self.export_path, shard.SHARDS_DIR, stats["batch_id"])))
+
+
+@unittest.skipUnless(shard.fcntl, "verrous de shard indisponibles sur ce système")
+class FencingTest(ShardTestCase):
+
+    def test_busy_shard_is_not_processed_twice(self) -> None:
+        manifest: Dict[str, Any] = shard.plan_shards(
+            [_make_image(os.path.join(self.root, "a.png"))], {}, self.export_path, 1
+        )[0]
+
+        # Une tentative précédente, toujours vivante, tient le verrou du shard
+        with open(f"{manifest['export_path']}.lock", mode="a") as lock_file:
+            shard.fcntl.flock(lock_file, shard.fcntl.LOCK_EX | shard.fcntl.LOCK_NB)
+            self.assertEqual(shard.run_shard(manifest["manifest_path"]), shard.EXIT_BUSY)
+        self.assertFalse(os.path.exists(manifest["result_path"]))
+
+        self.assertEqual(shard.run_shard(manifest["manifest_path"]), 0)
+        # Résultat déjà écrit : une nouvelle tentative ne retraite pas le shard
+        mtime: float = os.path.getmtime(manifest["result_path"])
+        self.assertEqual(shard.run_shard(manifest["manifest_path"]), 0)
+        self.assertEqual(os.path.getmtime(manifest["result_path"]), mtime)
+
+
+class SSHRunnerTest(unittest.TestCase):
+
+    def test_timeout_is_enforced_on_remote_host(self) -> None:
+        runner: shard.SSHRunner = shard.SSHRunner(["nas1"], "/opt/compresseur")
+        captured: Dict[str, Any] = {}
+
+        def execute(command: List[str], cwd: Optional[str], timeout: Optional[float]) -> Tuple[int, str]:
+            captured.update(command=command, timeout=timeout)
+            return 124, ""
+        runner._execute = execute
+
+        returncode, error_msg = runner.run("/partage/.shards/lot/shard-0000.json", timeout=60)
+
+        self.assertEqual(returncode, -1)
+        self.assertIn("Délai dépassé", error_msg)
+        self.assertEqual(captured["command"][:4], ["ssh", "-o", "BatchMode=yes", "nas1"])
+        self.assertIn("exec timeout --kill-after 10 60 python3 shard.py --worker", captured["command"][-1])
+        # Le client ssh local survit au délai distant (arrêt du processus distant d'abord)
+        self.assertGreater(captured["timeout"], 60 + shard.KILL_AFTER)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,429 @@
+import os
+import io
+import json
+import time
+import queue
+import hashlib
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import argparse
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from mvc.model import ApplicationModel
+from mvc.logging_config import setup_logging
+from utils import get_writable_path
+
+logger = logging.getLogger(__name__)
+
+
+# Extensions surveillées (les mêmes que la boîte de dialogue d'importation de la Vue)
+IMAGE_EXTENSIONS: Tuple[str, ...] = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+
+# Signature d'un fichier sur le disque : (taille, date de modification en ns)
+Signature = Tuple[int, int]
+
+# Intervalle (en secondes) de relecture complète du dossier en mode inotify, pour oublier
+# les fichiers traités qui ont quitté le dossier (le polling relit déjà le dossier à chaque passe)
+PRUNE_INTERVAL: float = 60.0
+
+# Dossier RELATIF où est sauvegardé, pour chaque dossier surveillé, le registre des fichiers traités
+STATE_DIR: str = "settings/watch_state"
+
+
+class _InotifySource:
+    """
+    Source d'événements basée sur inotify (Linux), appelée via ctypes : le noyau signale
+    les fichiers créés, fermés après écriture ou déplacés dans le dossier surveillé.
+    """
+
+    # Masques d'événements (cf. <sys/inotify.h>)
+    IN_CLOSE_WRITE: int = 0x00000008
+    IN_MOVED_TO: int = 0x00000080
+    IN_CREATE: int = 0x00000100
+    IN_Q_OVERFLOW: int = 0x00004000
+    # En-tête d'un événement : wd (int), mask, cookie, len (uint32)
+    EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+
+    def __init__(self, directory: str) -> None:
+        """
+        Ouvre une instance inotify et surveille le dossier.
+
+        Args:
+            directory: Le dossier à surveiller.
+
+        Raises:
+            OSError: Si inotify n'est pas disponible (autre système, limite de surveillances atteinte...).
+        """
+        libc_name: Optional[str] = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify non disponible sur ce système")
+
+        self.fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        mask: int = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno: int = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch a échoué pour {directory}")
+
+    def read(self, timeout: float) -> Optional[List[str]]:
+        """
+        Attend des événements pendant au plus timeout secondes.
+
+        Args:
+            timeout: Durée maximale d'attente (en secondes).
+
+        Returns:
+            Les noms de fichiers concernés (éventuellement vide), ou None si la file du noyau
+            a débordé (des événements ont été perdus : le dossier doit être relu entièrement).
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        names: List[str] = []
+        try:
+            buffer: bytes = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        offset: int = 0
+        while offset < len(buffer):
+            _wd, event_mask, _cookie, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.EVENT_HEADER.size
+            if event_mask & self.IN_Q_OVERFLOW:
+                return None
+            if length:
+                names.append(os.fsdecode(buffer[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self) -> None:
+        """Ferme l'instance inotify."""
+        os.close(self.fd)
+
+
+class _PollingSource:
+    """
+    Source de repli (autres systèmes, partages réseau sur lesquels inotify ne voit pas les écritures
+    distantes) : le dossier est relu entièrement à chaque intervalle.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """
+        Args:
+            interval: Intervalle entre deux relectures du dossier (en secondes).
+        """
+        self.interval: float = interval
+        self._next_scan: float = 0.0
+
+    def read(self, timeout: float) -> Optional[List[str]]:
+        """Attend au plus timeout secondes ; retourne None (relecture complète) à chaque intervalle."""
+        now: float = time.monotonic()
+        if now >= self._next_scan:
+            self._next_scan = now + self.interval
+            return None
+        time.sleep(min(timeout, self._next_scan - now))
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class HotFolderWatcher:
+    """
+    Surveille un dossier de dépôt et compresse en continu les images qui y arrivent,
+    avec les options et le dossier d'exportation sauvegardés par l'application.
+
+    Un fichier n'est traité qu'une fois stable (taille et date de modification inchangées
+    pendant settle secondes), c'est-à-dire entièrement copié. Les fichiers prêts sont regroupés
+    en lots d'au plus batch_size images, traités par des threads de compression, chacun avec
+    son propre ApplicationModel : la latence entre le dépôt et la sortie reste bornée par
+    le délai de stabilité plus la durée d'un lot.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        settle: float = 2.0,
+        interval: float = 1.0,
+        batch_size: int = 16,
+        workers: int = 1,
+        process_existing: bool = False,
+        use_polling: bool = False
+    ) -> None:
+        """
+        Args:
+            directory: Le dossier de dépôt à surveiller.
+            settle: Durée (en secondes) sans modification au bout de laquelle un fichier est considéré complet.
+            interval: Intervalle de relecture du dossier en mode polling (en secondes).
+            batch_size: Nombre maximal d'images par lot de compression.
+            workers: Nombre de threads de compression (les encodeurs de Pillow libèrent le GIL).
+            process_existing: Si True, traite aussi les images déjà présentes au démarrage.
+            use_polling: Force le mode polling même si inotify est disponible.
+        """
+        self.directory: str = os.path.abspath(directory)
+        self.settle: float = settle
+        self.interval: float = interval
+        self.batch_size: int = batch_size
+        self.workers: int = workers
+        self.process_existing: bool = process_existing
+        self.use_polling: bool = use_polling
+
+        # Options et dossier d'exportation sauvegardés par l'interface (settings/)
+        self.model: ApplicationModel = ApplicationModel()
+        self.options: Dict[str, Any] = self.model.read_options()
+        self.export_path: str = self.model.export_path
+
+        # Fichiers en attente de stabilité : {chemin: (signature, instant du dernier changement)}
+        self._pending: Dict[str, Tuple[Signature, float]] = {}
+        # Dernière signature traitée de chaque fichier (un fichier redéposé est traité à nouveau),
+        # sauvegardée pour traiter au redémarrage les fichiers déposés pendant l'arrêt
+        self.state_path: str = get_writable_path(
+            os.path.join(STATE_DIR, f"{hashlib.sha1(os.fsencode(self.directory)).hexdigest()[:16]}.json")
+        )
+        self._processed: Dict[str, Signature] = {}
+        # Vrai si un registre d'une surveillance précédente de ce dossier a été relu
+        self._resumed: bool = self._load_state()
+        # Lots prêts à être compressés (None = arrêt d'un thread de compression)
+        self._batches: "queue.Queue[Optional[List[str]]]" = queue.Queue()
+        self._stop: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        """Surveille le dossier jusqu'à l'appel de stop() (ou Ctrl+C)."""
+        if os.path.realpath(self.export_path) == os.path.realpath(self.directory):
+            # Les fichiers exportés seraient eux-mêmes détectés comme de nouveaux dépôts
+            raise ValueError("Le dossier surveillé ne peut pas être le dossier d'exportation.")
+
+        source: Any
+        if self.use_polling:
+            source = _PollingSource(self.interval)
+        else:
+            try:
+                source = _InotifySource(self.directory)
+            except OSError as e:
+                logger.info(f"inotify indisponible ({e}), surveillance par polling")
+                source = _PollingSource(self.interval)
+        logger.info(f"Surveillance de {self.directory} ({type(source).__name__}) -> {self.export_path}")
+
+        # Fichiers déjà présents : traités, ou marqués comme vus pour ne traiter que les nouveaux dépôts.
+        # Après une surveillance précédente, seuls les fichiers qu'elle a traités sont ignorés :
+        # ceux déposés (ou modifiés) pendant l'arrêt sont traités
+        found: List[Tuple[str, Signature]] = self._scan()
+        for path, signature in found:
+            if self.process_existing or self._resumed:
+                self._track(path, signature)
+            else:
+                self._processed[path] = signature
+        self._prune({path for path, _ in found})
+        self._save_state()
+
+        threads: List[threading.Thread] = [
+            threading.Thread(target=self._compress_batches, daemon=True) for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        last_scan: float = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                # Attente courte tant que des fichiers attendent leur stabilité
+                timeout: float = min(self.settle / 4, 0.5) if self._pending else self.interval
+                names: Optional[List[str]] = source.read(timeout)
+                if names is None or time.monotonic() - last_scan >= PRUNE_INTERVAL:
+                    # Relecture complète (polling, événements inotify perdus, ou relecture périodique)
+                    found: List[Tuple[str, Signature]] = self._scan()
+                    for path, signature in found:
+                        self._track(path, signature)
+                    self._prune({path for path, _ in found})
+                    last_scan = time.monotonic()
+                if names:
+                    for name in names:
+                        changed_path: str = os.path.join(self.directory, name)
+                        changed: Optional[Signature] = self._signature(changed_path)
+                        if changed and self._is_image(name):
+                            self._track(changed_path, changed)
+                self._dispatch_ready()
+        finally:
+            source.close()
+            for _ in threads:
+                self._batches.put(None)
+            for thread in threads:
+                thread.join()
+
+    def stop(self) -> None:
+        """Demande l'arrêt de la surveillance (les lots en cours sont terminés)."""
+        self._stop.set()
+
+    @staticmethod
+    def _is_image(name: str) -> bool:
+        """Indique si un nom de fichier a une extension d'image surveillée."""
+        return name.lower().endswith(IMAGE_EXTENSIONS)
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Signature]:
+        """Retourne (taille, date de modification) d'un fichier régulier, ou None s'il a disparu."""
+        try:
+            stat: os.stat_result = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _scan(self) -> List[Tuple[str, Signature]]:
+        """Liste les images du dossier surveillé avec leur signature (une seule passe os.scandir)."""
+        found: List[Tuple[str, Signature]] = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not self._is_image(entry.name):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat: os.stat_result = entry.stat()
+                except OSError:
+                    continue
+                found.append((entry.path, (stat.st_size, stat.st_mtime_ns)))
+        return found
+
+    def _prune(self, present: set) -> None:
+        """
+        Oublie les fichiers traités qui ne sont plus dans le dossier (déplacés ou supprimés après
+        traitement) : sans cela, le registre grandirait indéfiniment pendant toute la surveillance.
+
+        Args:
+            present: Chemins des images présentes lors de la dernière relecture complète.
+        """
+        gone: List[str] = [p for p in self._processed if p not in present]
+        for path in gone:
+            del self._processed[path]
+        if gone:
+            self._save_state()
+
+    def _load_state(self) -> bool:
+        """
+        Relit le registre des fichiers traités sauvegardé par une surveillance précédente du dossier.
+
+        Returns:
+            True si un registre valide a été relu, False sinon (première surveillance, fichier corrompu).
+        """
+        try:
+            with io.open(self.state_path, mode="r", encoding="utf-8") as f:
+                state: Any = json.load(f)
+            processed: Dict[str, Signature] = {
+                os.path.join(self.directory, name): (int(size), int(mtime_ns))
+                for name, (size, mtime_ns) in state["processed"].items()
+            }
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            logger.error(f"Registre de surveillance ignoré ({self.state_path}): {e}")
+            return False
+        self._processed.update(processed)
+        return True
+
+    def _save_state(self) -> None:
+        """Sauvegarde (de manière atomique) le registre des fichiers traités du dossier surveillé."""
+        state: Dict[str, Any] = {
+            "directory": self.directory,
+            "processed": {os.path.basename(path): list(signature) for path, signature in self._processed.items()},
+        }
+        temp_path: str = f"{self.state_path}.part"
+        try:
+            with io.open(temp_path, mode="w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.error(f"Erreur lors de la sauvegarde du registre de surveillance: {e}")
+
+    def _track(self, path: str, signature: Signature) -> None:
+        """Met (ou remet) un fichier en attente de stabilité s'il est nouveau ou a changé."""
+        if self._processed.get(path) == signature:
+            return
+        previous: Optional[Tuple[Signature, float]] = self._pending.get(path)
+        if previous is None or previous[0] != signature:
+            self._pending[path] = (signature, time.monotonic())
+
+    def _dispatch_ready(self) -> None:
+        """Envoie en lots les fichiers stables depuis au moins settle secondes aux threads de compression."""
+        now: float = time.monotonic()
+        ready: List[str] = []
+        for path, (signature, changed_at) in list(self._pending.items()):
+            if now - changed_at < self.settle:
+                continue
+            current: Optional[Signature] = self._signature(path)
+            if current is None:
+                # Fichier supprimé ou déplacé avant d'être complet
+                del self._pending[path]
+            elif current != signature:
+                # Encore en cours d'écriture : le délai de stabilité repart
+                self._pending[path] = (current, now)
+            elif current[0] > 0:
+                del self._pending[path]
+                self._processed[path] = current
+                ready.append(path)
+
+        if ready:
+            self._save_state()
+        for start in range(0, len(ready), self.batch_size):
+            self._batches.put(ready[start:start + self.batch_size])
+
+    def _compress_batches(self) -> None:
+        """Boucle d'un thread de compression : traite les lots de la file avec son propre Modèle."""
+        model: ApplicationModel = ApplicationModel()
+        while True:
+            files: Optional[List[str]] = self._batches.get()
+            if files is None:
+                break
+            try:
+                loaded: int = model.load_images(files)
+                if not loaded:
+                    logger.error(f"Aucune image valide dans le lot: {files}")
+                    continue
+                model.export_path = self.export_path
+                success_count, stats = model.process_and_export(self.options)
+                if success_count:
+                    logger.info(
+                        f"Lot de {loaded} image(s) exporté : {success_count} succès, "
+                        f"{stats['total_old_mo']:.2f} Mo -> {stats['total_new_mo']:.2f} Mo"
+                    )
+                else:
+                    logger.error(f"Échec du lot: {stats.get('error_msg', 'aucune image traitée')}")
+            except Exception as e:
+                logger.error(f"Erreur de traitement du lot {files}: {e}")
+            finally:
+                model.reset_data()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Surveille un dossier de dépôt et compresse les nouvelles images avec les options sauvegardées."
+    )
+    parser.add_argument("directory", help="Dossier à surveiller")
+    parser.add_argument("--settle", type=float, default=2.0, help="Délai de stabilité d'un fichier en secondes (défaut: 2)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Intervalle du polling en secondes (défaut: 1)")
+    parser.add_argument("--batch-size", type=int, default=16, help="Nombre maximal d'images par lot (défaut: 16)")
+    parser.add_argument("--workers", type=int, default=1, help="Nombre de threads de compression (défaut: 1)")
+    parser.add_argument("--existing", action="store_true", help="Traite aussi les images déjà présentes")
+    parser.add_argument("--poll", action="store_true", help="Force le polling (ex: partage réseau)")
+    args = parser.parse_args()
+
+    setup_logging()
+    watcher: HotFolderWatcher = HotFolderWatcher(
+        args.directory,
+        settle=args.settle,
+        interval=args.interval,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        process_existing=args.existing,
+        use_polling=args.poll,
+    )
+    print(f"Surveillance de {watcher.directory} -> {watcher.export_path} (Ctrl+C pour arrêter)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass